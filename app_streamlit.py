@@ -1,11 +1,34 @@
 import streamlit as st 
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 import sqlite3
 import os
+import time
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
+from data_prep import merge_destinations, data_version
+from filter_cache import FilterCache
+from search_index import SearchIndex
+from spatial_index import SpatialIndex
+from similarity import SimilarityTable, DEFAULT_PATH as SIMILARITY_PATH
+from figure_encoding import plotly_chart
+from figures import (
+    prepare_map_data,
+    build_city_chart,
+    build_category_pie,
+    build_rating_by_category_chart,
+    build_price_by_category_chart,
+    build_top_destinations_chart,
+    build_map,
+    build_age_histogram,
+    build_users_city_chart,
+    build_most_reviewed_chart,
+    build_review_rating_histogram,
+)
+from query_executor import QueryExecutor
+from reviewer_index import ReviewerIndex
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Load environment variables dari .env
 load_dotenv()
@@ -73,15 +96,19 @@ try:
         safe_url = DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'unknown'
         print(f"🔗 Connecting to: {safe_url}")
     
-    # Membuat Engine
+    # Membuat Engine (opsi koneksi PostgreSQL tidak berlaku untuk SQLite lokal)
+    if DATABASE_URL.startswith("sqlite"):
+        connect_args = {}
+    else:
+        connect_args = {
+            "connect_timeout": 10,
+            "sslmode": "require" if "supabase" in DATABASE_URL else "disable"
+        }
     engine = create_engine(
         DATABASE_URL, 
         echo=False,
         pool_pre_ping=True,
-        connect_args={
-            "connect_timeout": 10,
-            "sslmode": "require" if "supabase" in DATABASE_URL else "disable"
-        }
+        connect_args=connect_args
     )
     print("✅ Database engine created successfully")
     
@@ -266,20 +293,85 @@ st.markdown("""
 # ====================================================
 # FUNGSI UNTUK LOAD DATA
 # ====================================================
-@st.cache_data
+@st.cache_resource
+def get_query_executor():
+    """Eksekutor query tunggal per proses (single-flight + memo hasil + pembatalan)"""
+    return QueryExecutor(engine, timeout=float(os.getenv('QUERY_TIMEOUT', '30')))
+
+def current_yield_check():
+    """Callback rerun/stop milik rerun ini (None di luar Streamlit)"""
+    ctx = get_script_run_ctx()
+    return getattr(ctx, 'yield_check', None) if ctx else None
+
 def load_data():
-    """Load data dari database"""
+    """Load data dari database
+
+    Tidak memakai st.cache_data: memo hasil ada di QueryExecutor, sehingga sesi
+    yang bersamaan menumpang query yang sama dan rerun yang sudah diganti rerun
+    baru berhenti menunggu tanpa terkunci lock cache.
+    """
+    executor = get_query_executor()
+    yield_check = current_yield_check()
     try:
-        df_destinations = pd.read_sql("SELECT * FROM destinations", engine)
-        df_users = pd.read_sql("SELECT * FROM users", engine)
-        df_reviews = pd.read_sql("SELECT * FROM reviews", engine)
-        df_cities = pd.read_sql("SELECT * FROM cities", engine)
-        df_categories = pd.read_sql("SELECT * FROM categories", engine)
+        df_destinations = executor.read_sql("SELECT * FROM destinations", yield_check=yield_check)
+        df_users = executor.read_sql("SELECT * FROM users", yield_check=yield_check)
+        df_reviews = executor.read_sql("SELECT * FROM reviews", yield_check=yield_check)
+        df_cities = executor.read_sql("SELECT * FROM cities", yield_check=yield_check)
+        df_categories = executor.read_sql("SELECT * FROM categories", yield_check=yield_check)
         return df_destinations, df_users, df_reviews, df_cities, df_categories
     except Exception as e:
         st.error(f"❌ Gagal load data: {e}")
         return None, None, None, None, None
 
+@st.cache_resource
+def prepare_destinations():
+    """Merge destinasi-kota-kategori sekali per data, dibagi ke semua sesi"""
+    df_destinations, _, _, df_cities, df_categories = load_data()
+    df_merged = merge_destinations(df_destinations, df_cities, df_categories)
+    version = data_version(df_destinations, df_cities, df_categories)
+    return df_merged, version
+
+@st.cache_resource
+def get_search_index(_df_merged, version):
+    """Index trigram nama_tempat, dibangun sekali per versi data"""
+    return SearchIndex(_df_merged['nama_tempat'].tolist(), _df_merged['rating_rata2'].to_numpy())
+
+@st.cache_resource
+def get_spatial_index(_df_merged, version):
+    """Index grid koordinat destinasi, dibangun sekali per versi data"""
+    return SpatialIndex(_df_merged['lat'].to_numpy(), _df_merged['long'].to_numpy())
+
+@st.cache_resource
+def get_id_index(_df_merged, version):
+    """Index id_tempat -> posisi baris df_merged, dibangun sekali per versi data"""
+    return pd.Index(_df_merged['id_tempat'])
+
+@st.cache_resource
+def get_similarity_table(mtime):
+    """Tabel destinasi serupa hasil batch similarity.py (dimuat ulang jika file berubah)"""
+    return SimilarityTable.load(SIMILARITY_PATH)
+
+@st.cache_resource
+def prepare_reviews_version():
+    """Sidik jari tabel users dan reviews"""
+    _, df_users, df_reviews, _, _ = load_data()
+    return data_version(df_users, df_reviews)
+
+@st.cache_resource
+def get_reviewer_index(_df_merged, _df_users, _df_reviews, version, reviews_version):
+    """Index destinasi -> pengguna yang mereview, dibangun sekali per versi data"""
+    return ReviewerIndex(
+        _df_merged['id_tempat'].to_numpy(),
+        _df_users['id_pengguna'].to_numpy(),
+        _df_reviews['id_tempat'].to_numpy(),
+        _df_reviews['id_pengguna'].to_numpy()
+    )
+
+@st.cache_resource
+def get_filter_cache():
+    """Cache hasil filter tunggal per proses"""
+    return FilterCache()
+
 # ====================================================
 # HEADER PROFESIONAL
 # ====================================================
@@ -290,7 +382,8 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Load data
+# Load data (timeout query muncul sebagai error biasa)
+query_executor = get_query_executor()
 df_destinations, df_users, df_reviews, df_cities, df_categories = load_data()
 
 if df_destinations is None:
@@ -328,14 +421,40 @@ with st.sidebar:
 # ====================================================
 # FILTER DATA
 # ====================================================
-df_filtered = df_destinations.merge(df_cities, left_on='id_kota', right_on='id_kota', how='left')
-df_filtered = df_filtered.merge(df_categories, left_on='id_kategori', right_on='id_kategori', how='left')
+df_merged, data_ver = prepare_destinations()
+reviews_ver = prepare_reviews_version()
+filter_cache = get_filter_cache()
 
-df_filtered = df_filtered[
-    (df_filtered['nama_kota'].isin(selected_cities)) &
-    (df_filtered['nama_kategori'].isin(selected_categories)) &
-    (df_filtered['rating_rata2'] >= min_rating)
-]
+# Hasil filter (posisi baris + metrik) di-memo lintas sesi
+filter_result = filter_cache.get_or_compute(
+    df_merged, selected_cities, selected_categories, min_rating, data_ver
+)
+df_filtered = df_merged.iloc[filter_result.positions]
+
+with st.sidebar:
+    with st.expander("⚙️ Statistik Cache Filter"):
+        cache_stats = filter_cache.stats()
+        st.caption(
+            f"Hit rate: {cache_stats['hit_rate']:.1%} "
+            f"({cache_stats['hits']:,} hit / {cache_stats['misses']:,} miss)"
+        )
+        st.caption(
+            f"Entri: {cache_stats['entries']:,} · "
+            f"{cache_stats['bytes'] / 1024:,.0f} KB · "
+            f"Eviction: {cache_stats['evictions']:,}"
+        )
+    with st.expander("⚙️ Statistik Query"):
+        query_stats = query_executor.stats()
+        st.caption(
+            f"Dieksekusi: {query_stats['executed']:,} · "
+            f"Digabung: {query_stats['coalesced']:,} · "
+            f"Diambil alih: {query_stats['taken_over']:,}"
+        )
+        st.caption(
+            f"Dibatalkan: {query_stats['cancelled']:,} · "
+            f"Timeout: {query_stats['timed_out']:,} · "
+            f"Berjalan: {query_stats['in_flight']:,}"
+        )
 
 # ====================================================
 # KEY METRICS
@@ -345,7 +464,7 @@ st.markdown('<div class="section-title">📊 RINGKASAN DATA UTAMA</div>', unsafe
 col1, col2, col3, col4, col5 = st.columns(5, gap="large")
 
 with col1:
-    st.metric(label="Total Destinasi", value=f"{len(df_filtered):,}")
+    st.metric(label="Total Destinasi", value=f"{filter_result.count:,}")
 
 with col2:
     st.metric(label="Total Pengguna", value=f"{len(df_users):,}")
@@ -354,11 +473,11 @@ with col3:
     st.metric(label="Total Review", value=f"{len(df_reviews):,}")
 
 with col4:
-    avg_rating = df_filtered['rating_rata2'].mean()
+    avg_rating = filter_result.avg_rating
     st.metric(label="Rating Rata-rata", value=f"{avg_rating:.2f}★")
 
 with col5:
-    avg_price = df_filtered['harga_tiket'].mean()
+    avg_price = filter_result.avg_price
     st.metric(label="Harga Rata-rata", value=f"Rp {avg_price:,.0f}")
 
 st.markdown("---")
@@ -387,13 +506,54 @@ with tab1:
     """, unsafe_allow_html=True)
     
     display_cols = ['nama_tempat', 'nama_kota', 'nama_kategori', 'rating_rata2', 'harga_tiket']
+    # Jumlah opsi pemilih destinasi (di sini dan di tab Peta), diambil dari baris teratas tabel
+    pick_limit = 50
+    
+    search_query = st.text_input(
+        "🔎 Cari Destinasi:",
+        placeholder="Ketik nama tempat, misal: pantai kuta",
+        help="Mendukung awalan, potongan kata, dan salah ketik ringan"
+    )
+    
+    if search_query.strip():
+        search_index = get_search_index(df_merged, data_ver)
+        search_start = time.perf_counter()
+        search_positions = search_index.search(search_query, allowed_positions=filter_result.positions)
+        search_ms = (time.perf_counter() - search_start) * 1000
+        st.caption(f"{len(search_positions):,} hasil untuk \"{search_query}\" ({search_ms:.1f} ms)")
+        df_table = df_merged.iloc[search_positions][display_cols]
+    else:
+        df_table = df_filtered[display_cols].sort_values('rating_rata2', ascending=False)
+    
     st.dataframe(
-        df_filtered[display_cols].sort_values('rating_rata2', ascending=False),
+        df_table,
         width='stretch',
         hide_index=True,
         use_container_width=True
     )
     
+    # Pengunjung juga menyukai (hasil batch similarity.py)
+    if os.path.exists(SIMILARITY_PATH) and len(df_table) > 0:
+        st.markdown('<h3>💞 Pengunjung Juga Menyukai</h3>', unsafe_allow_html=True)
+        similarity_table = get_similarity_table(os.path.getmtime(SIMILARITY_PATH))
+        # Pilihan diambil dari baris teratas tabel di atas (hasil cari / rating tertinggi);
+        # index df_merged = posisi baris, jadi opsi cukup berupa posisi
+        selected_pos = st.selectbox(
+            "Pilih destinasi:",
+            options=df_table.index[:pick_limit].tolist(),
+            format_func=lambda pos: df_merged['nama_tempat'].iat[pos],
+            help=f"{pick_limit} destinasi teratas dari tabel; gunakan pencarian untuk destinasi lain"
+        )
+        similar_ids, similar_scores = similarity_table.similar(df_merged['id_tempat'].iat[selected_pos], k=10)
+        similar_pos = get_id_index(df_merged, data_ver).get_indexer(similar_ids)
+        found = similar_pos >= 0
+        if found.any():
+            df_similar = df_merged.iloc[similar_pos[found]][['nama_tempat', 'nama_kota', 'nama_kategori', 'rating_rata2']]
+            df_similar = df_similar.assign(skor_kemiripan=similar_scores[found].round(3))
+            st.dataframe(df_similar, use_container_width=True, hide_index=True, width='stretch')
+        else:
+            st.info("Belum ada data review yang cukup untuk destinasi ini.")
+    
     csv = df_filtered[display_cols].to_csv(index=False)
     col1, col2 = st.columns([1, 4])
     with col1:
@@ -413,193 +573,31 @@ with tab2:
     
     # Destinasi per Kota
     st.markdown('<h3>📍 Jumlah Destinasi per Kota</h3>', unsafe_allow_html=True)
-    dest_by_city = df_filtered.groupby('nama_kota').size().reset_index(name='jumlah')
-    dest_by_city = dest_by_city.sort_values('jumlah', ascending=True)
-    
-    fig_city = px.bar(
-        dest_by_city,
-        x='jumlah',
-        y='nama_kota',
-        orientation='h',
-        title="Destinasi per Kota",
-        labels={'nama_kota': 'Kota', 'jumlah': 'Jumlah'},
-        color='jumlah',
-        color_continuous_scale=[[0, '#0ea5e9'], [1, '#0369a1']],
-        text='jumlah'
-    )
-    fig_city.update_traces(
-        textposition='outside',
-        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-        marker=dict(line=dict(color='#0369a1', width=3))
-    )
-    fig_city.update_layout(
-        height=500,
-        hovermode='y unified',
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff',
-        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-        showlegend=False,
-        xaxis_title="<b>Jumlah Destinasi</b>",
-        yaxis_title="<b>Kota</b>",
-        title_font_size=18
-    )
-    fig_city.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-    fig_city.update_yaxes(showgrid=False)
-    st.plotly_chart(fig_city, use_container_width=True)
+    fig_city = build_city_chart(df_filtered)
+    plotly_chart(fig_city, use_container_width=True)
     
     # Baris kedua
     col1, col2 = st.columns(2, gap="large")
     
     with col1:
         st.markdown('<h3>🏷️ Distribusi Kategori</h3>', unsafe_allow_html=True)
-        dest_by_cat = df_filtered.groupby('nama_kategori').size().reset_index(name='jumlah')
-        dest_by_cat = dest_by_cat.sort_values('jumlah', ascending=False)
-        
-        vibrant_colors = ['#0369a1', '#0891b2', '#059669', '#ca8a04', '#dc2626', '#7c3aed', '#be185d']
-        
-        fig_cat = px.pie(
-            dest_by_cat,
-            values='jumlah',
-            names='nama_kategori',
-            title="Proporsi Kategori Destinasi",
-            color_discrete_sequence=vibrant_colors,
-            hole=0.3
-        )
-        fig_cat.update_layout(
-            height=450,
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            paper_bgcolor='#ffffff',
-            showlegend=True,
-            title_font_size=18
-        )
-        fig_cat.update_traces(
-            textposition='auto',
-            textfont=dict(size=16, color='#000000', family='Arial Black', weight='bold'),
-            hovertemplate='<b>%{label}</b><br>Jumlah: %{value}<extra></extra>'
-        )
-        st.plotly_chart(fig_cat, use_container_width=True)
+        fig_cat = build_category_pie(df_filtered)
+        plotly_chart(fig_cat, use_container_width=True)
     
     with col2:
         st.markdown('<h3>⭐ Rating Rata-rata per Kategori</h3>', unsafe_allow_html=True)
-        rating_by_cat = df_filtered.groupby('nama_kategori')['rating_rata2'].mean().reset_index()
-        rating_by_cat = rating_by_cat.sort_values('rating_rata2', ascending=True)
-        
-        # Format rating untuk display (1 desimal)
-        rating_by_cat['rating_formatted'] = rating_by_cat['rating_rata2'].apply(lambda x: f'{x:.1f}★')
-        
-        fig_rating = px.bar(
-            rating_by_cat,
-            x='rating_rata2',
-            y='nama_kategori',
-            orientation='h',
-            title="Rating per Kategori",
-            labels={'nama_kategori': 'Kategori', 'rating_rata2': 'Rating'},
-            color='rating_rata2',
-            color_continuous_scale=[[0, '#ef4444'], [0.5, '#eab308'], [1, '#22c55e']]
-        )
-        fig_rating.update_traces(
-            textposition='outside',
-            textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-            customdata=rating_by_cat['rating_formatted'],
-            text=rating_by_cat['rating_formatted'],
-            hovertemplate='<b>%{y}</b><br>Rating: %{customdata}<extra></extra>',
-            marker=dict(line=dict(color='#065f46', width=3))
-        )
-        fig_rating.update_layout(
-            height=450,
-            hovermode='y unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            showlegend=False,
-            xaxis_title="<b>Rating</b>",
-            yaxis_title="<b>Kategori</b>",
-            title_font_size=18
-        )
-        fig_rating.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        fig_rating.update_yaxes(showgrid=False)
-        st.plotly_chart(fig_rating, use_container_width=True)
+        fig_rating = build_rating_by_category_chart(df_filtered)
+        plotly_chart(fig_rating, use_container_width=True)
     
     # Harga Tiket per Kategori
     st.markdown('<h3>💰 Harga Tiket per Kategori</h3>', unsafe_allow_html=True)
-    price_by_cat = df_filtered.groupby('nama_kategori')['harga_tiket'].mean().reset_index()
-    price_by_cat = price_by_cat.sort_values('harga_tiket', ascending=True)
-    
-    # Format harga untuk display
-    price_by_cat['harga_formatted'] = price_by_cat['harga_tiket'].apply(lambda x: f'Rp {x:,.0f}')
-    
-    fig_price = px.bar(
-        price_by_cat,
-        x='harga_tiket',
-        y='nama_kategori',
-        orientation='h',
-        title="Harga Tiket Rata-rata",
-        labels={'nama_kategori': 'Kategori', 'harga_tiket': 'Harga (Rp)'},
-        color='harga_tiket',
-        color_continuous_scale=[[0, '#06b6d4'], [1, '#0369a1']]
-    )
-    fig_price.update_traces(
-        textposition='outside',
-        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-        customdata=price_by_cat['harga_formatted'],
-        text=price_by_cat['harga_formatted'],
-        hovertemplate='<b>%{y}</b><br>Harga: %{customdata}<extra></extra>',
-        marker=dict(line=dict(color='#0369a1', width=3))
-    )
-    fig_price.update_layout(
-        height=400,
-        hovermode='y unified',
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff',
-        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-        showlegend=False,
-        xaxis_title="<b>Harga (Rp)</b>",
-        yaxis_title="<b>Kategori</b>",
-        title_font_size=18
-    )
-    fig_price.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-    fig_price.update_yaxes(showgrid=False)
-    st.plotly_chart(fig_price, use_container_width=True)
+    fig_price = build_price_by_category_chart(df_filtered)
+    plotly_chart(fig_price, decimals={'x': 0}, use_container_width=True)
     
     # Top 10 Destinasi
     st.markdown('<h3>🏆 TOP 10 DESTINASI TERBAIK</h3>', unsafe_allow_html=True)
-    top_ratings = df_filtered.nlargest(10, 'rating_rata2')[['nama_tempat', 'rating_rata2']].reset_index(drop=True)
-    
-    # Format rating untuk display (1 desimal)
-    top_ratings['rating_formatted'] = top_ratings['rating_rata2'].apply(lambda x: f'{x:.1f}★')
-    
-    fig_top = px.bar(
-        top_ratings,
-        x='rating_rata2',
-        y='nama_tempat',
-        orientation='h',
-        title="Top 10 Destinasi Berdasarkan Rating",
-        labels={'rating_rata2': 'Rating', 'nama_tempat': 'Destinasi'},
-        color='rating_rata2',
-        color_continuous_scale=[[0, '#eab308'], [1, '#16a34a']]
-    )
-    fig_top.update_traces(
-        textposition='outside',
-        customdata=top_ratings['rating_formatted'],
-        text=top_ratings['rating_formatted'],
-        hovertemplate='<b>%{y}</b><br>Rating: %{customdata}<extra></extra>',
-        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-        marker=dict(line=dict(color='#15803d', width=3))
-    )
-    fig_top.update_layout(
-        height=500,
-        hovermode='y unified',
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff',
-        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-        showlegend=False,
-        xaxis_title="<b>Rating (0-5)</b>",
-        yaxis_title="<b>Destinasi</b>",
-        title_font_size=18
-    )
-    fig_top.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-    fig_top.update_yaxes(showgrid=False)
-    st.plotly_chart(fig_top, use_container_width=True)
+    fig_top = build_top_destinations_chart(df_filtered)
+    plotly_chart(fig_top, use_container_width=True)
 
 # ====================================================
 # TAB 3: PETA
@@ -613,33 +611,60 @@ with tab3:
         </div>
     """, unsafe_allow_html=True)
     
-    map_data = df_filtered[['nama_tempat', 'lat', 'long', 'rating_rata2']].copy()
-    map_data.columns = ['nama', 'latitude', 'longitude', 'rating']
-    map_data = map_data.dropna(subset=['latitude', 'longitude'])
+    map_data = prepare_map_data(df_filtered)
     
     if len(map_data) > 0:
-        fig_map = px.scatter_mapbox(
-            map_data,
-            lat='latitude',
-            lon='longitude',
-            hover_name='nama',
-            hover_data={'rating': ':.2f', 'latitude': False, 'longitude': False},
-            color='rating',
-            color_continuous_scale=[[0, '#ef4444'], [0.5, '#fbbf24'], [1, '#10b981']],
-            zoom=4,
-            title="Peta Destinasi Pariwisata Indonesia",
-            mapbox_style="open-street-map",
-            size_max=20
-        )
-        fig_map.update_layout(
-            height=700,
-            margin={"r": 0, "t": 40, "l": 0, "b": 0},
-            font=dict(size=12, color='#1e3a8a'),
-            hovermode='closest'
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
+        fig_map = build_map(map_data)
+        plotly_chart(fig_map, use_container_width=True)
     else:
         st.warning("⚠️ Data koordinat tidak tersedia untuk ditampilkan di peta.")
+    
+    # Destinasi terdekat dari suatu titik
+    st.markdown('<h3>📍 Destinasi Terdekat</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2, gap="large")
+    with col1:
+        center_mode = st.radio("Titik pusat:", ["Destinasi", "Koordinat"], horizontal=True)
+        # Opsi dari baris teratas tabel Destinasi yang punya koordinat, berupa posisi baris
+        center_options = df_table.index[:pick_limit].to_numpy()
+        center_options = center_options[
+            pd.notna(df_merged['lat'].to_numpy()[center_options])
+            & pd.notna(df_merged['long'].to_numpy()[center_options])
+        ]
+        if center_mode == "Destinasi" and len(center_options) > 0:
+            center_pos = st.selectbox(
+                "Pilih destinasi:",
+                options=center_options.tolist(),
+                format_func=lambda pos: df_merged['nama_tempat'].iat[pos],
+                help=f"{pick_limit} destinasi teratas tabel Destinasi; gunakan pencarian untuk destinasi lain"
+            )
+            center_lat = float(df_merged['lat'].iat[center_pos])
+            center_lon = float(df_merged['long'].iat[center_pos])
+        else:
+            center_lat = st.number_input("Latitude:", min_value=-90.0, max_value=90.0, value=-6.2, format="%.4f")
+            center_lon = st.number_input("Longitude:", min_value=-180.0, max_value=180.0, value=106.8, format="%.4f")
+    with col2:
+        near_mode = st.radio("Jenis pencarian:", ["Dalam radius", "K terdekat"], horizontal=True)
+        if near_mode == "Dalam radius":
+            radius_km = st.slider("Radius (km):", min_value=1, max_value=200, value=25)
+        else:
+            k_nearest = st.slider("Jumlah destinasi:", min_value=1, max_value=50, value=10)
+    
+    spatial_index = get_spatial_index(df_merged, data_ver)
+    allowed_mask = np.zeros(len(df_merged), dtype=bool)
+    allowed_mask[filter_result.positions] = True
+    
+    if near_mode == "Dalam radius":
+        near_positions, near_km = spatial_index.within_radius(center_lat, center_lon, radius_km, allowed=allowed_mask)
+    else:
+        near_positions, near_km = spatial_index.nearest(center_lat, center_lon, k_nearest, allowed=allowed_mask)
+    
+    if len(near_positions) > 0:
+        df_near = df_merged.iloc[near_positions][['nama_tempat', 'nama_kota', 'nama_kategori', 'rating_rata2']].copy()
+        df_near['jarak_km'] = near_km.round(1)
+        st.dataframe(df_near, use_container_width=True, hide_index=True, width='stretch')
+    else:
+        st.info("Tidak ada destinasi yang sesuai di sekitar titik ini.")
 
 # ====================================================
 # TAB 4: PENGGUNA
@@ -647,90 +672,45 @@ with tab3:
 with tab4:
     st.markdown('<div class="section-title">👥 ANALISIS PENGGUNA</div>', unsafe_allow_html=True)
     
-    st.markdown('<h3>📊 Statistik Umur</h3>', unsafe_allow_html=True)
-    col1, col2, col3, col4 = st.columns(4, gap="large")
-    
-    with col1:
-        st.metric("Rata-rata Umur", f"{df_users['umur'].mean():.0f} tahun")
-    with col2:
-        st.metric("Median Umur", f"{df_users['umur'].median():.0f} tahun")
-    with col3:
-        st.metric("Umur Minimal", f"{int(df_users['umur'].min())} tahun")
-    with col4:
-        st.metric("Umur Maksimal", f"{int(df_users['umur'].max())} tahun")
-    
-    col1, col2 = st.columns(2, gap="large")
-    
-    with col1:
-        st.markdown('<h3>📈 Distribusi Umur Pengguna</h3>', unsafe_allow_html=True)
-        fig_age = px.histogram(
-            df_users,
-            x='umur',
-            nbins=25,
-            title="Histogram Umur Pengguna",
-            labels={'umur': 'Umur (tahun)', 'count': 'Jumlah Pengguna'},
-            color_discrete_sequence=['#0ea5e9']
-        )
-        fig_age.update_traces(
-            marker_line_color='#0369a1',
-            marker_line_width=3,
-            marker=dict(opacity=0.95),
-            hovertemplate='Umur: %{x}<br>Jumlah: %{y}<extra></extra>',
-            textfont=dict(size=12, color='#000000', family='Arial Black', weight='bold')
-        )
-        fig_age.update_layout(
-            height=450,
-            hovermode='x unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            xaxis_title="<b>Umur (tahun)</b>",
-            yaxis_title="<b>Jumlah Pengguna</b>",
-            title_font_size=18
-        )
-        fig_age.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        fig_age.update_yaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        st.plotly_chart(fig_age, use_container_width=True)
+    # Pengguna yang mereview destinasi hasil filter (semi-join lewat index CSR),
+    # termasuk saat semua destinasi terpilih: pengguna tanpa review tidak ikut
+    reviewer_index = get_reviewer_index(df_merged, df_users, df_reviews, data_ver, reviews_ver)
+    df_users_filtered = df_users[reviewer_index.reviewer_mask(filter_result.positions)]
+    st.markdown(f"""
+        <div class="info-card">
+            <strong>💡 Informasi:</strong> Menampilkan {len(df_users_filtered):,} dari {len(df_users):,} pengguna, yaitu pengguna yang mereview destinasi sesuai filter.
+        </div>
+    """, unsafe_allow_html=True)
     
-    with col2:
-        st.markdown('<h3>🏙️ Top 10 Kota Asal Pengguna</h3>', unsafe_allow_html=True)
-        users_by_city = df_users['asal_kota'].value_counts().head(10).reset_index()
-        users_by_city.columns = ['kota', 'jumlah']
-        users_by_city = users_by_city.sort_values('jumlah', ascending=True)
+    if len(df_users_filtered) == 0:
+        st.warning("⚠️ Tidak ada pengguna yang mereview destinasi sesuai filter.")
+    else:
+        st.markdown('<h3>📊 Statistik Umur</h3>', unsafe_allow_html=True)
+        col1, col2, col3, col4 = st.columns(4, gap="large")
         
-        fig_users_city = px.bar(
-            users_by_city,
-            x='jumlah',
-            y='kota',
-            orientation='h',
-            title="Pengguna per Kota",
-            labels={'kota': 'Kota', 'jumlah': 'Jumlah'},
-            color='jumlah',
-            color_continuous_scale=[[0, '#06b6d4'], [1, '#0369a1']],
-            text='jumlah'
-        )
-        fig_users_city.update_traces(
-            textposition='outside',
-            textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-            marker=dict(line=dict(color='#0369a1', width=3))
-        )
-        fig_users_city.update_layout(
-            height=450,
-            hovermode='y unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            showlegend=False,
-            xaxis_title="<b>Jumlah Pengguna</b>",
-            yaxis_title="<b>Kota</b>",
-            title_font_size=18
-        )
-        fig_users_city.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        fig_users_city.update_yaxes(showgrid=False)
-        st.plotly_chart(fig_users_city, use_container_width=True)
-    
-    st.markdown('<h3>📋 Daftar Pengguna</h3>', unsafe_allow_html=True)
-    st.dataframe(df_users.sort_values('umur', ascending=False), use_container_width=True, hide_index=True, width='stretch')
+        with col1:
+            st.metric("Rata-rata Umur", f"{df_users_filtered['umur'].mean():.0f} tahun")
+        with col2:
+            st.metric("Median Umur", f"{df_users_filtered['umur'].median():.0f} tahun")
+        with col3:
+            st.metric("Umur Minimal", f"{int(df_users_filtered['umur'].min())} tahun")
+        with col4:
+            st.metric("Umur Maksimal", f"{int(df_users_filtered['umur'].max())} tahun")
+        
+        col1, col2 = st.columns(2, gap="large")
+        
+        with col1:
+            st.markdown('<h3>📈 Distribusi Umur Pengguna</h3>', unsafe_allow_html=True)
+            fig_age = build_age_histogram(df_users_filtered)
+            plotly_chart(fig_age, use_container_width=True)
+        
+        with col2:
+            st.markdown('<h3>🏙️ Top 10 Kota Asal Pengguna</h3>', unsafe_allow_html=True)
+            fig_users_city = build_users_city_chart(df_users_filtered)
+            plotly_chart(fig_users_city, use_container_width=True)
+        
+        st.markdown('<h3>📋 Daftar Pengguna</h3>', unsafe_allow_html=True)
+        st.dataframe(df_users_filtered.sort_values('umur', ascending=False), use_container_width=True, hide_index=True, width='stretch')
 
 # ====================================================
 # TAB 5: REVIEW
@@ -758,70 +738,13 @@ with tab5:
     
     with col1:
         st.markdown('<h3>🏆 Top 10 Destinasi Paling Direview</h3>', unsafe_allow_html=True)
-        reviews_per_dest = df_reviews_detail.groupby('nama_tempat').size().reset_index(name='jumlah_review')
-        reviews_per_dest = reviews_per_dest.nlargest(10, 'jumlah_review').sort_values('jumlah_review', ascending=True)
-        
-        fig_reviews = px.bar(
-            reviews_per_dest,
-            x='jumlah_review',
-            y='nama_tempat',
-            orientation='h',
-            title="Destinasi Paling Banyak Direview",
-            labels={'nama_tempat': 'Destinasi', 'jumlah_review': 'Jumlah Review'},
-            color='jumlah_review',
-            color_continuous_scale=[[0, '#0ea5e9'], [1, '#0369a1']],
-            text='jumlah_review'
-        )
-        fig_reviews.update_traces(
-            textposition='outside',
-            textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
-            marker=dict(line=dict(color='#0369a1', width=3))
-        )
-        fig_reviews.update_layout(
-            height=450,
-            hovermode='y unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            showlegend=False,
-            xaxis_title="<b>Jumlah Review</b>",
-            yaxis_title="<b>Destinasi</b>",
-            title_font_size=18
-        )
-        fig_reviews.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        fig_reviews.update_yaxes(showgrid=False)
-        st.plotly_chart(fig_reviews, use_container_width=True)
+        fig_reviews = build_most_reviewed_chart(df_reviews_detail)
+        plotly_chart(fig_reviews, use_container_width=True)
     
     with col2:
         st.markdown('<h3>📊 Distribusi Skor Rating</h3>', unsafe_allow_html=True)
-        fig_rating_dist = px.histogram(
-            df_reviews,
-            x='rating',
-            nbins=5,
-            title="Histogram Rating Review",
-            labels={'rating': 'Skor Rating', 'count': 'Jumlah Review'},
-            color_discrete_sequence=['#16a34a']
-        )
-        fig_rating_dist.update_traces(
-            marker_line_color='#15803d',
-            marker_line_width=3,
-            marker=dict(opacity=0.95),
-            hovertemplate='Rating: %{x}<br>Jumlah: %{y}<extra></extra>',
-            textfont=dict(size=12, color='#000000', family='Arial Black', weight='bold')
-        )
-        fig_rating_dist.update_layout(
-            height=450,
-            hovermode='x unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
-            xaxis_title="<b>Skor Rating</b>",
-            yaxis_title="<b>Jumlah Review</b>",
-            title_font_size=18
-        )
-        fig_rating_dist.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        fig_rating_dist.update_yaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
-        st.plotly_chart(fig_rating_dist, use_container_width=True)
+        fig_rating_dist = build_review_rating_histogram(df_reviews)
+        plotly_chart(fig_rating_dist, use_container_width=True)
     
     st.markdown('<h3>📋 Daftar Review</h3>', unsafe_allow_html=True)
     display_review_cols = ['id_pengguna', 'nama_tempat', 'nama_kota', 'rating']
@@ -0,0 +1,253 @@
+# batch_report.py
+import argparse
+import html
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from data_prep import merge_destinations
+from figure_encoding import compact_figure
+from figures import (
+    prepare_map_data,
+    build_city_chart,
+    build_category_pie,
+    build_rating_by_category_chart,
+    build_price_by_category_chart,
+    build_top_destinations_chart,
+    build_map,
+    build_age_histogram,
+    build_users_city_chart,
+    build_most_reviewed_chart,
+    build_review_rating_histogram,
+)
+from reviewer_index import ReviewerIndex
+
+# ====================================================
+# RENDER LAPORAN STATIS PER KOTA / PER KATEGORI
+# ====================================================
+# Contoh:
+#   python batch_report.py --output reports --workers 8
+#   python batch_report.py --database-url sqlite:///pariwisata.db --format parquet --only kota
+
+DISPLAY_COLS = ['nama_tempat', 'nama_kota', 'nama_kategori', 'rating_rata2', 'harga_tiket']
+
+# Jenis slice -> kolom di data destinasi
+SLICE_COLUMNS = {
+    'kota': 'nama_kota',
+    'kategori': 'nama_kategori',
+}
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+    body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 2rem; color: #0c2d4d; }}
+    .header-section {{ background: linear-gradient(135deg, #3b82f6 0%, #06b6d4 100%); padding: 2rem;
+                       border-radius: 1rem; color: white; margin-bottom: 2rem; }}
+    .header-section h1 {{ margin: 0; }}
+    .metrics {{ display: flex; gap: 1rem; margin-bottom: 2rem; }}
+    .metric {{ background: linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%); color: white; padding: 1rem 1.5rem;
+               border-radius: 0.75rem; font-weight: 700; }}
+    .metric span {{ display: block; font-size: 1.8rem; font-weight: 800; }}
+    h3 {{ color: #1e3a8a; }}
+</style>
+</head>
+<body>
+<div class="header-section">
+    <h1>🏖️ {title}</h1>
+    <p>📊 Snapshot Dashboard Pariwisata Indonesia · {generated}</p>
+</div>
+<div class="metrics">{metrics}</div>
+{sections}
+</body>
+</html>
+"""
+
+# Data milik proses worker, diisi sekali oleh initializer
+_DATA = None
+
+
+def load_report_data(engine):
+    """Load semua tabel sekali dan siapkan data turunan yang dipakai setiap slice"""
+    df_destinations = pd.read_sql("SELECT * FROM destinations", engine)
+    df_users = pd.read_sql("SELECT * FROM users", engine)
+    df_reviews = pd.read_sql("SELECT * FROM reviews", engine)
+    df_cities = pd.read_sql("SELECT * FROM cities", engine)
+    df_categories = pd.read_sql("SELECT * FROM categories", engine)
+
+    df_merged = merge_destinations(df_destinations, df_cities, df_categories)
+    reviewer_index = ReviewerIndex(
+        df_merged['id_tempat'].to_numpy(),
+        df_users['id_pengguna'].to_numpy(),
+        df_reviews['id_tempat'].to_numpy(),
+        df_reviews['id_pengguna'].to_numpy()
+    )
+    return {
+        'df_merged': df_merged,
+        'df_users': df_users,
+        'df_reviews': df_reviews,
+        'reviewer_index': reviewer_index,
+    }
+
+
+def _init_worker(data):
+    # Dengan start method fork (Linux) data diwarisi tanpa pickle; selain itu
+    # data di-pickle sekali per worker, bukan sekali per slice
+    global _DATA
+    _DATA = data
+
+
+def slugify(value):
+    # Transliterasi aksen (é -> e) dulu agar nama non-ASCII tidak menjadi kosong
+    value = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^0-9a-z]+', '-', value.lower()).strip('-') or 'kosong'
+
+
+def unique_slugs(values):
+    """Slug nama file per nilai; slug yang bentrok diberi akhiran -2, -3, dst."""
+    slugs, used = {}, set()
+    for value in values:
+        base = slug = slugify(value)
+        counter = 1
+        while slug in used:
+            counter += 1
+            slug = f"{base}-{counter}"
+        used.add(slug)
+        slugs[value] = slug
+    return slugs
+
+
+def _metric(label, value):
+    return f'<div class="metric">{html.escape(label)}<span>{html.escape(value)}</span></div>'
+
+
+def render_slice(kind, value, slug, output_dir, extract_format):
+    """Render satu slice ke HTML mandiri + extract data, kembalikan jumlah destinasi"""
+    df_merged = _DATA['df_merged']
+    df_users = _DATA['df_users']
+    df_reviews = _DATA['df_reviews']
+
+    positions = np.flatnonzero((df_merged[SLICE_COLUMNS[kind]] == value).to_numpy())
+    df_filtered = df_merged.iloc[positions]
+    reviewer_index = _DATA['reviewer_index']
+    df_users_slice = df_users[reviewer_index.reviewer_mask(positions)]
+    # Review slice diambil dari index CSR, bukan join ulang seluruh tabel reviews
+    review_rows, review_dest = reviewer_index.reviews_of(positions)
+    df_reviews_detail = df_reviews.iloc[review_rows].assign(
+        nama_tempat=df_merged['nama_tempat'].to_numpy()[review_dest],
+        nama_kota=df_merged['nama_kota'].to_numpy()[review_dest]
+    )
+
+    figures = [
+        ('📍 Jumlah Destinasi per Kota', build_city_chart(df_filtered), None),
+        ('🏷️ Distribusi Kategori', build_category_pie(df_filtered), None),
+        ('⭐ Rating Rata-rata per Kategori', build_rating_by_category_chart(df_filtered), None),
+        ('💰 Harga Tiket per Kategori', build_price_by_category_chart(df_filtered), {'x': 0}),
+        ('🏆 Top 10 Destinasi Terbaik', build_top_destinations_chart(df_filtered), None),
+    ]
+    map_data = prepare_map_data(df_filtered)
+    if len(map_data) > 0:
+        figures.append(('🗺️ Peta Destinasi', build_map(map_data), None))
+    if len(df_users_slice) > 0:
+        figures.append(('📈 Distribusi Umur Pengguna', build_age_histogram(df_users_slice), None))
+        figures.append(('🏙️ Top 10 Kota Asal Pengguna', build_users_city_chart(df_users_slice), None))
+    if len(df_reviews_detail) > 0:
+        figures.append(('🏆 Top 10 Destinasi Paling Direview', build_most_reviewed_chart(df_reviews_detail), None))
+        figures.append(('📊 Distribusi Skor Rating', build_review_rating_histogram(df_reviews_detail), None))
+
+    # plotly.js disisipkan sekali (figure pertama) agar file bisa dibuka offline
+    sections = []
+    for i, (heading, fig, decimals) in enumerate(figures):
+        fig_html = compact_figure(fig, decimals).to_html(
+            full_html=False,
+            include_plotlyjs=True if i == 0 else False
+        )
+        sections.append(f'<h3>{html.escape(heading)}</h3>\n{fig_html}')
+
+    metrics = ''.join([
+        _metric("Total Destinasi", f"{len(df_filtered):,}"),
+        _metric("Total Pengguna", f"{len(df_users_slice):,}"),
+        _metric("Total Review", f"{len(df_reviews_detail):,}"),
+        _metric("Rating Rata-rata", f"{df_filtered['rating_rata2'].mean():.2f}★"),
+        _metric("Harga Rata-rata", f"Rp {df_filtered['harga_tiket'].mean():,.0f}"),
+    ])
+
+    slice_dir = os.path.join(output_dir, kind)
+    os.makedirs(slice_dir, exist_ok=True)
+    base = os.path.join(slice_dir, slug)
+    with open(f"{base}.html", 'w', encoding='utf-8') as f:
+        f.write(HTML_TEMPLATE.format(
+            title=html.escape(f"{kind.title()}: {value}"),
+            generated=time.strftime('%Y-%m-%d %H:%M'),
+            metrics=metrics,
+            sections='\n'.join(sections)
+        ))
+
+    extract = df_filtered[DISPLAY_COLS].sort_values('rating_rata2', ascending=False)
+    if extract_format == 'parquet':
+        extract.to_parquet(f"{base}.parquet", index=False)
+    else:
+        extract.to_csv(f"{base}.csv", index=False)
+    return len(df_filtered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render laporan HTML statis per kota dan per kategori")
+    parser.add_argument('--output', default='reports', help="Folder hasil")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Jumlah proses worker")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help="Format extract data")
+    parser.add_argument('--only', choices=list(SLICE_COLUMNS), default=None, help="Hanya satu jenis slice")
+    parser.add_argument('--database-url', default=None,
+                        help="URL database (default: konfigurasi dari config.py)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from config import engine
+
+    start = time.perf_counter()
+    data = load_report_data(engine)
+    print(f"📥 Data dimuat dalam {time.perf_counter() - start:.1f} detik")
+
+    kinds = [args.only] if args.only else list(SLICE_COLUMNS)
+    # Slug dihitung di proses induk agar nama file unik walau nama slice mirip
+    slices = [
+        (kind, value, slug)
+        for kind in kinds
+        for value, slug in unique_slugs(sorted(data['df_merged'][SLICE_COLUMNS[kind]].dropna().unique())).items()
+    ]
+
+    start = time.perf_counter()
+    done = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(data,)) as pool:
+        futures = {
+            pool.submit(render_slice, kind, value, slug, args.output, args.format): (kind, value)
+            for kind, value, slug in slices
+        }
+        for future in as_completed(futures):
+            kind, value = futures[future]
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"❌ Gagal render {kind} '{value}': {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {done:,} slice dirender ke {args.output} dalam {elapsed:.1f} detik "
+          f"({done / elapsed if elapsed > 0 else 0:,.1f} slice/detik)")
+    if failed:
+        print(f"⚠️ {failed:,} slice gagal")
+
+
+if __name__ == '__main__':
+    main()
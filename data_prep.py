@@ -0,0 +1,28 @@
+# data_prep.py
+import hashlib
+
+import pandas as pd
+
+# ====================================================
+# PERSIAPAN DATA DESTINASI
+# ====================================================
+
+def merge_destinations(df_destinations, df_cities, df_categories):
+    """Gabungkan destinasi dengan nama kota dan kategori"""
+    df_merged = df_destinations.merge(df_cities, left_on='id_kota', right_on='id_kota', how='left')
+    df_merged = df_merged.merge(df_categories, left_on='id_kategori', right_on='id_kategori', how='left')
+    # Index posisi 0..n-1 supaya array posisi baris bisa dipakai langsung dengan iloc
+    return df_merged.reset_index(drop=True)
+
+
+def data_version(*frames):
+    """Sidik jari isi tabel, berubah setiap kali data di database berubah"""
+    digest = hashlib.sha1()
+    for df in frames:
+        if df is None:
+            digest.update(b'none')
+            continue
+        digest.update(str(df.shape).encode())
+        digest.update(','.join(map(str, df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,115 @@
+# figure_encoding.py
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+# ====================================================
+# SERIALISASI FIGURE PLOTLY YANG RINGKAS
+# ====================================================
+
+# Plotly >= 6 mengirim array numpy sebagai base64 typed array ({dtype, bdata});
+# versi lama mengirim list JSON, jadi array float tidak diturunkan ke float32
+try:
+    from _plotly_utils.utils import to_typed_array_spec  # noqa: F401
+    TYPED_ARRAYS = True
+except ImportError:
+    TYPED_ARRAYS = False
+
+# Jumlah desimal yang dikirim ke browser, per nama atribut trace
+DEFAULT_DECIMALS = 2
+DECIMALS = {
+    'lat': 5,
+    'lon': 5,
+}
+
+# Batas nilai agar pembulatan tetap presisi di float32 (mantissa 24 bit)
+FLOAT32_EXACT = 2 ** 24
+
+
+def _compact_numeric(values, decimals):
+    """Bulatkan ke presisi tampilan lalu pakai dtype sekecil mungkin"""
+    values = np.round(values.astype(np.float64), decimals)
+    finite = np.isfinite(values)
+    if finite.all() and len(values) > 0 and np.array_equal(values, np.round(values)):
+        lo, hi = values.min(), values.max()
+        for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+    if TYPED_ARRAYS and np.all(np.abs(values[finite]) * 10 ** decimals < FLOAT32_EXACT):
+        return values.astype(np.float32)
+    return values
+
+
+def _compact_strings(values):
+    """Array string yang isinya sama semua cukup dikirim sebagai satu nilai"""
+    if len(values) > 1 and all(v == values[0] for v in values):
+        return values[0]
+    return values
+
+
+def _compact_props(props, decimals):
+    for key, value in list(props.items()):
+        if isinstance(value, dict):
+            _compact_props(value, decimals)
+            continue
+        if isinstance(value, (list, tuple)):
+            value = np.asarray(value)
+        if not isinstance(value, np.ndarray) or value.ndim == 0:
+            continue
+        if value.dtype.kind in 'iuf':
+            props[key] = _compact_numeric(value, decimals.get(key, DEFAULT_DECIMALS))
+        elif value.dtype.kind in 'OU' and value.ndim == 1 and key in ('text', 'hovertext'):
+            props[key] = _compact_strings(value.tolist())
+
+
+def _dedupe_customdata(trace):
+    """Buang customdata yang tidak dipakai atau hanya duplikat dari text"""
+    if 'customdata' not in trace:
+        return
+    templates = [trace.get('hovertemplate'), trace.get('texttemplate')]
+    templates = [t for t in templates if isinstance(t, str)]
+    if not any('customdata' in t for t in templates):
+        # px menyimpan kolom hover_data di customdata walaupun template tidak memakainya
+        del trace['customdata']
+        return
+
+    customdata = np.asarray(trace['customdata'])
+    text = trace.get('text')
+    if customdata.ndim == 1 and text is not None and np.array_equal(customdata, np.asarray(text)):
+        for name in ('hovertemplate', 'texttemplate'):
+            if isinstance(trace.get(name), str):
+                trace[name] = trace[name].replace('%{customdata}', '%{text}')
+        if not any(
+            'customdata' in trace[name]
+            for name in ('hovertemplate', 'texttemplate')
+            if isinstance(trace.get(name), str)
+        ):
+            del trace['customdata']
+
+
+def compact_figure(fig, decimals=None):
+    """Salinan figure dengan data trace dibulatkan, dtype diperkecil, dan duplikat dibuang"""
+    decimals = {**DECIMALS, **(decimals or {})}
+    traces = []
+    for trace in fig.data:
+        props = trace.to_plotly_json()
+        _dedupe_customdata(props)
+        _compact_props(props, decimals)
+        traces.append(props)
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def plotly_chart(fig, decimals=None, **kwargs):
+    """Pengganti st.plotly_chart yang mengirim figure versi ringkas"""
+    compact = compact_figure(fig, decimals)
+    # Dibaca saat dipanggil karena .env baru dimuat setelah modul ini di-import
+    if os.getenv('DEBUG_MODE', 'false').lower() == 'true':
+        before = len(pio.to_json(fig, validate=False))
+        after = len(pio.to_json(compact, validate=False))
+        title = fig.layout.title.text or '-'
+        print(f"📦 Figure '{title}': {before:,} -> {after:,} byte ({after / max(before, 1):.0%})")
+    return st.plotly_chart(compact, **kwargs)
@@ -0,0 +1,369 @@
+# figures.py
+import plotly.express as px
+
+# ====================================================
+# PEMBUAT FIGURE DASHBOARD
+# ====================================================
+# Dipakai bersama oleh app_streamlit.py dan batch_report.py (tanpa sesi Streamlit)
+
+
+def prepare_map_data(df_filtered):
+    """Kolom koordinat destinasi untuk peta, tanpa baris yang tidak punya lat/long"""
+    map_data = df_filtered[['nama_tempat', 'lat', 'long', 'rating_rata2']].copy()
+    map_data.columns = ['nama', 'latitude', 'longitude', 'rating']
+    return map_data.dropna(subset=['latitude', 'longitude'])
+
+
+def build_city_chart(df_filtered):
+    """Bar jumlah destinasi per kota"""
+    dest_by_city = df_filtered.groupby('nama_kota').size().reset_index(name='jumlah')
+    dest_by_city = dest_by_city.sort_values('jumlah', ascending=True)
+
+    fig = px.bar(
+        dest_by_city,
+        x='jumlah',
+        y='nama_kota',
+        orientation='h',
+        title="Destinasi per Kota",
+        labels={'nama_kota': 'Kota', 'jumlah': 'Jumlah'},
+        color='jumlah',
+        color_continuous_scale=[[0, '#0ea5e9'], [1, '#0369a1']],
+        text='jumlah'
+    )
+    fig.update_traces(
+        textposition='outside',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        marker=dict(line=dict(color='#0369a1', width=3))
+    )
+    fig.update_layout(
+        height=500,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Jumlah Destinasi</b>",
+        yaxis_title="<b>Kota</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_category_pie(df_filtered):
+    """Pie proporsi kategori destinasi"""
+    dest_by_cat = df_filtered.groupby('nama_kategori').size().reset_index(name='jumlah')
+    dest_by_cat = dest_by_cat.sort_values('jumlah', ascending=False)
+
+    vibrant_colors = ['#0369a1', '#0891b2', '#059669', '#ca8a04', '#dc2626', '#7c3aed', '#be185d']
+
+    fig = px.pie(
+        dest_by_cat,
+        values='jumlah',
+        names='nama_kategori',
+        title="Proporsi Kategori Destinasi",
+        color_discrete_sequence=vibrant_colors,
+        hole=0.3
+    )
+    fig.update_layout(
+        height=450,
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        paper_bgcolor='#ffffff',
+        showlegend=True,
+        title_font_size=18
+    )
+    fig.update_traces(
+        textposition='auto',
+        textfont=dict(size=16, color='#000000', family='Arial Black', weight='bold'),
+        hovertemplate='<b>%{label}</b><br>Jumlah: %{value}<extra></extra>'
+    )
+    return fig
+
+
+def build_rating_by_category_chart(df_filtered):
+    """Bar rating rata-rata per kategori"""
+    rating_by_cat = df_filtered.groupby('nama_kategori')['rating_rata2'].mean().reset_index()
+    rating_by_cat = rating_by_cat.sort_values('rating_rata2', ascending=True)
+
+    # Format rating untuk display (1 desimal)
+    rating_by_cat['rating_formatted'] = rating_by_cat['rating_rata2'].apply(lambda x: f'{x:.1f}★')
+
+    fig = px.bar(
+        rating_by_cat,
+        x='rating_rata2',
+        y='nama_kategori',
+        orientation='h',
+        title="Rating per Kategori",
+        labels={'nama_kategori': 'Kategori', 'rating_rata2': 'Rating'},
+        color='rating_rata2',
+        color_continuous_scale=[[0, '#ef4444'], [0.5, '#eab308'], [1, '#22c55e']]
+    )
+    fig.update_traces(
+        textposition='outside',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        customdata=rating_by_cat['rating_formatted'],
+        text=rating_by_cat['rating_formatted'],
+        hovertemplate='<b>%{y}</b><br>Rating: %{customdata}<extra></extra>',
+        marker=dict(line=dict(color='#065f46', width=3))
+    )
+    fig.update_layout(
+        height=450,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Rating</b>",
+        yaxis_title="<b>Kategori</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_price_by_category_chart(df_filtered):
+    """Bar harga tiket rata-rata per kategori"""
+    price_by_cat = df_filtered.groupby('nama_kategori')['harga_tiket'].mean().reset_index()
+    price_by_cat = price_by_cat.sort_values('harga_tiket', ascending=True)
+
+    # Format harga untuk display
+    price_by_cat['harga_formatted'] = price_by_cat['harga_tiket'].apply(lambda x: f'Rp {x:,.0f}')
+
+    fig = px.bar(
+        price_by_cat,
+        x='harga_tiket',
+        y='nama_kategori',
+        orientation='h',
+        title="Harga Tiket Rata-rata",
+        labels={'nama_kategori': 'Kategori', 'harga_tiket': 'Harga (Rp)'},
+        color='harga_tiket',
+        color_continuous_scale=[[0, '#06b6d4'], [1, '#0369a1']]
+    )
+    fig.update_traces(
+        textposition='outside',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        customdata=price_by_cat['harga_formatted'],
+        text=price_by_cat['harga_formatted'],
+        hovertemplate='<b>%{y}</b><br>Harga: %{customdata}<extra></extra>',
+        marker=dict(line=dict(color='#0369a1', width=3))
+    )
+    fig.update_layout(
+        height=400,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Harga (Rp)</b>",
+        yaxis_title="<b>Kategori</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_top_destinations_chart(df_filtered):
+    """Bar top 10 destinasi berdasarkan rating"""
+    top_ratings = df_filtered.nlargest(10, 'rating_rata2')[['nama_tempat', 'rating_rata2']].reset_index(drop=True)
+
+    # Format rating untuk display (1 desimal)
+    top_ratings['rating_formatted'] = top_ratings['rating_rata2'].apply(lambda x: f'{x:.1f}★')
+
+    fig = px.bar(
+        top_ratings,
+        x='rating_rata2',
+        y='nama_tempat',
+        orientation='h',
+        title="Top 10 Destinasi Berdasarkan Rating",
+        labels={'rating_rata2': 'Rating', 'nama_tempat': 'Destinasi'},
+        color='rating_rata2',
+        color_continuous_scale=[[0, '#eab308'], [1, '#16a34a']]
+    )
+    fig.update_traces(
+        textposition='outside',
+        customdata=top_ratings['rating_formatted'],
+        text=top_ratings['rating_formatted'],
+        hovertemplate='<b>%{y}</b><br>Rating: %{customdata}<extra></extra>',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        marker=dict(line=dict(color='#15803d', width=3))
+    )
+    fig.update_layout(
+        height=500,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Rating (0-5)</b>",
+        yaxis_title="<b>Destinasi</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_map(map_data):
+    """Peta sebaran destinasi berwarna sesuai rating"""
+    fig = px.scatter_mapbox(
+        map_data,
+        lat='latitude',
+        lon='longitude',
+        hover_name='nama',
+        hover_data={'rating': ':.2f', 'latitude': False, 'longitude': False},
+        color='rating',
+        color_continuous_scale=[[0, '#ef4444'], [0.5, '#fbbf24'], [1, '#10b981']],
+        zoom=4,
+        title="Peta Destinasi Pariwisata Indonesia",
+        mapbox_style="open-street-map",
+        size_max=20
+    )
+    fig.update_layout(
+        height=700,
+        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+        font=dict(size=12, color='#1e3a8a'),
+        hovermode='closest'
+    )
+    return fig
+
+
+def build_age_histogram(df_users):
+    """Histogram umur pengguna"""
+    fig = px.histogram(
+        df_users,
+        x='umur',
+        nbins=25,
+        title="Histogram Umur Pengguna",
+        labels={'umur': 'Umur (tahun)', 'count': 'Jumlah Pengguna'},
+        color_discrete_sequence=['#0ea5e9']
+    )
+    fig.update_traces(
+        marker_line_color='#0369a1',
+        marker_line_width=3,
+        marker=dict(opacity=0.95),
+        hovertemplate='Umur: %{x}<br>Jumlah: %{y}<extra></extra>',
+        textfont=dict(size=12, color='#000000', family='Arial Black', weight='bold')
+    )
+    fig.update_layout(
+        height=450,
+        hovermode='x unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        xaxis_title="<b>Umur (tahun)</b>",
+        yaxis_title="<b>Jumlah Pengguna</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    return fig
+
+
+def build_users_city_chart(df_users):
+    """Bar top 10 kota asal pengguna"""
+    users_by_city = df_users['asal_kota'].value_counts().head(10).reset_index()
+    users_by_city.columns = ['kota', 'jumlah']
+    users_by_city = users_by_city.sort_values('jumlah', ascending=True)
+
+    fig = px.bar(
+        users_by_city,
+        x='jumlah',
+        y='kota',
+        orientation='h',
+        title="Pengguna per Kota",
+        labels={'kota': 'Kota', 'jumlah': 'Jumlah'},
+        color='jumlah',
+        color_continuous_scale=[[0, '#06b6d4'], [1, '#0369a1']],
+        text='jumlah'
+    )
+    fig.update_traces(
+        textposition='outside',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        marker=dict(line=dict(color='#0369a1', width=3))
+    )
+    fig.update_layout(
+        height=450,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Jumlah Pengguna</b>",
+        yaxis_title="<b>Kota</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_most_reviewed_chart(df_reviews_detail):
+    """Bar top 10 destinasi paling banyak direview"""
+    reviews_per_dest = df_reviews_detail.groupby('nama_tempat').size().reset_index(name='jumlah_review')
+    reviews_per_dest = reviews_per_dest.nlargest(10, 'jumlah_review').sort_values('jumlah_review', ascending=True)
+
+    fig = px.bar(
+        reviews_per_dest,
+        x='jumlah_review',
+        y='nama_tempat',
+        orientation='h',
+        title="Destinasi Paling Banyak Direview",
+        labels={'nama_tempat': 'Destinasi', 'jumlah_review': 'Jumlah Review'},
+        color='jumlah_review',
+        color_continuous_scale=[[0, '#0ea5e9'], [1, '#0369a1']],
+        text='jumlah_review'
+    )
+    fig.update_traces(
+        textposition='outside',
+        textfont=dict(size=18, color='#000000', family='Arial Black', weight='bold'),
+        marker=dict(line=dict(color='#0369a1', width=3))
+    )
+    fig.update_layout(
+        height=450,
+        hovermode='y unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        showlegend=False,
+        xaxis_title="<b>Jumlah Review</b>",
+        yaxis_title="<b>Destinasi</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def build_review_rating_histogram(df_reviews):
+    """Histogram skor rating review"""
+    fig = px.histogram(
+        df_reviews,
+        x='rating',
+        nbins=5,
+        title="Histogram Rating Review",
+        labels={'rating': 'Skor Rating', 'count': 'Jumlah Review'},
+        color_discrete_sequence=['#16a34a']
+    )
+    fig.update_traces(
+        marker_line_color='#15803d',
+        marker_line_width=3,
+        marker=dict(opacity=0.95),
+        hovertemplate='Rating: %{x}<br>Jumlah: %{y}<extra></extra>',
+        textfont=dict(size=12, color='#000000', family='Arial Black', weight='bold')
+    )
+    fig.update_layout(
+        height=450,
+        hovermode='x unified',
+        plot_bgcolor='#ffffff',
+        paper_bgcolor='#ffffff',
+        font=dict(size=15, color='#0c2d4d', family='Arial', weight='bold'),
+        xaxis_title="<b>Skor Rating</b>",
+        yaxis_title="<b>Jumlah Review</b>",
+        title_font_size=18
+    )
+    fig.update_xaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    fig.update_yaxes(gridcolor='#cffafe', gridwidth=2, showgrid=True)
+    return fig
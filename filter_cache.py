@@ -0,0 +1,112 @@
+# filter_cache.py
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+# ====================================================
+# CACHE HASIL FILTER (LRU, DIBAGI ANTAR SESI)
+# ====================================================
+
+# Perkiraan overhead per entri (key, tuple, objek numpy) di luar array posisi
+ENTRY_OVERHEAD_BYTES = 512
+
+
+@dataclass(frozen=True)
+class FilterResult:
+    """Posisi baris hasil filter beserta metrik turunannya"""
+    positions: np.ndarray
+    count: int
+    avg_rating: float
+    avg_price: float
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes + ENTRY_OVERHEAD_BYTES
+
+
+def make_key(selected_cities, selected_categories, min_rating, version):
+    """Key kanonik: urutan pilihan multiselect tidak mempengaruhi hasil"""
+    return (
+        tuple(sorted(selected_cities)),
+        tuple(sorted(selected_categories)),
+        round(float(min_rating), 2),
+        version,
+    )
+
+
+def compute_filter(df_merged, selected_cities, selected_categories, min_rating):
+    """Jalankan filter kota/kategori/rating pada data destinasi yang sudah di-merge"""
+    mask = (
+        df_merged['nama_kota'].isin(selected_cities).to_numpy() &
+        df_merged['nama_kategori'].isin(selected_categories).to_numpy() &
+        (df_merged['rating_rata2'] >= min_rating).to_numpy()
+    )
+    positions = np.flatnonzero(mask)
+    return FilterResult(
+        positions=positions,
+        count=len(positions),
+        avg_rating=float(df_merged['rating_rata2'].iloc[positions].mean()),
+        avg_price=float(df_merged['harga_tiket'].iloc[positions].mean()),
+    )
+
+
+class FilterCache:
+    """Cache LRU hasil filter dengan batas jumlah entri dan total byte"""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, df_merged, selected_cities, selected_categories, min_rating, version):
+        key = make_key(selected_cities, selected_categories, min_rating, version)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Hitung di luar lock supaya sesi lain tidak ikut menunggu
+        result = compute_filter(df_merged, selected_cities, selected_categories, min_rating)
+        self._put(key, result)
+        return result
+
+    def _put(self, key, result):
+        if result.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = result
+            self._bytes += result.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
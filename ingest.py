@@ -0,0 +1,167 @@
+# ingest.py
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+# ====================================================
+# INGESTION DATA (CSV / PARQUET) KE DATABASE
+# ====================================================
+# Contoh:
+#   python ingest.py cities=data/cities.csv categories=data/categories.csv \
+#                    destinations=data/destinations.parquet reviews=data/reviews.csv
+#   python ingest.py reviews=reviews.csv --database-url sqlite:///pariwisata.db
+
+# Urutan load: tabel induk dulu supaya foreign key bisa divalidasi
+TABLE_ORDER = ['cities', 'categories', 'destinations', 'users', 'reviews']
+
+# kolom -> (tabel induk, kolom induk)
+FOREIGN_KEYS = {
+    'destinations': {
+        'id_kota': ('cities', 'id_kota'),
+        'id_kategori': ('categories', 'id_kategori'),
+    },
+}
+
+
+def iter_batches(path, batch_size):
+    """Baca file per batch tanpa memuat seluruh isi ke memori"""
+    # Dtype nullable (Int64, dst.) agar kolom integer ber-NULL tidak menjadi
+    # float64 lalu ditulis sebagai "1.0" yang ditolak COPY untuk kolom integer
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ Membaca Parquet membutuhkan pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas().convert_dtypes()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_size, dtype_backend='numpy_nullable')
+
+
+def load_reference_keys(engine, table):
+    """Ambil nilai key tabel induk yang sudah ada di database"""
+    keys = {}
+    for column, (parent, parent_column) in FOREIGN_KEYS.get(table, {}).items():
+        keys[column] = pd.read_sql(f"SELECT {parent_column} FROM {parent}", engine)[parent_column].to_numpy()
+    return keys
+
+
+def validate_foreign_keys(batch, reference_keys):
+    """Mask baris yang semua foreign key-nya valid (NULL dianggap valid)"""
+    valid = np.ones(len(batch), dtype=bool)
+    for column, keys in reference_keys.items():
+        values = batch[column]
+        valid &= values.isna().to_numpy() | values.isin(keys).to_numpy()
+    return valid
+
+
+def _copy_postgres(raw_conn, table, batch):
+    """COPY FROM STDIN, jalur bulk tercepat di PostgreSQL"""
+    buffer = io.StringIO()
+    batch.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    columns = ', '.join(batch.columns)
+    with raw_conn.cursor() as cursor:
+        # copy_expert khusus psycopg2; driver lain (psycopg 3, pg8000) punya API COPY berbeda
+        if not hasattr(cursor, 'copy_expert'):
+            raise ValueError("COPY PostgreSQL membutuhkan driver psycopg2 (postgresql+psycopg2://...)")
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _executemany_sqlite(raw_conn, table, batch):
+    """executemany dalam satu transaksi per batch"""
+    columns = ', '.join(batch.columns)
+    placeholders = ', '.join('?' for _ in batch.columns)
+    # astype(object) mengubah skalar numpy ke tipe Python yang dikenali sqlite3
+    rows = batch.astype(object).where(batch.notna(), None).itertuples(index=False, name=None)
+    cursor = raw_conn.cursor()
+    try:
+        cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+    finally:
+        cursor.close()
+
+
+def ingest_table(engine, table, path, batch_size=100_000, on_invalid='skip'):
+    """Load satu file ke satu tabel, kembalikan (baris masuk, baris ditolak, detik)
+
+    Mode 'skip' commit per batch; mode 'fail' memakai satu transaksi untuk
+    seluruh file sehingga pelanggaran foreign key tidak meninggalkan load parsial.
+    """
+    reference_keys = load_reference_keys(engine, table)
+    dialect = engine.dialect.name
+    start = time.perf_counter()
+    loaded = rejected = 0
+
+    raw_conn = engine.raw_connection()
+    try:
+        for batch in iter_batches(path, batch_size):
+            valid = validate_foreign_keys(batch, reference_keys)
+            if not valid.all():
+                if on_invalid == 'fail':
+                    raise ValueError(f"{(~valid).sum():,} baris {table} melanggar foreign key")
+                rejected += int((~valid).sum())
+                batch = batch[valid]
+
+            if dialect == 'postgresql':
+                _copy_postgres(raw_conn, table, batch)
+            elif dialect == 'sqlite':
+                _executemany_sqlite(raw_conn, table, batch)
+            else:
+                raise ValueError(f"Backend {dialect} belum didukung")
+            if on_invalid != 'fail':
+                raw_conn.commit()
+
+            loaded += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"   {table}: {loaded:,} baris ({loaded / elapsed:,.0f} baris/detik)")
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    return loaded, rejected, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingestion CSV/Parquet ke tabel dashboard pariwisata")
+    parser.add_argument('sources', nargs='+', metavar='TABEL=FILE',
+                        help=f"Pasangan tabel dan file, tabel salah satu dari: {', '.join(TABLE_ORDER)}")
+    parser.add_argument('--batch-size', type=int, default=100_000, help="Jumlah baris per batch")
+    parser.add_argument('--on-invalid', choices=['skip', 'fail'], default='skip',
+                        help="Perlakuan baris yang melanggar foreign key "
+                             "(fail: satu transaksi per file, dibatalkan seluruhnya)")
+    parser.add_argument('--database-url', default=None,
+                        help="URL database (default: konfigurasi dari config.py)")
+    args = parser.parse_args()
+
+    sources = {}
+    for source in args.sources:
+        table, _, path = source.partition('=')
+        if table not in TABLE_ORDER or not path:
+            parser.error(f"Sumber tidak valid: {source}")
+        sources[table] = path
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from config import engine
+
+    for table in sorted(sources, key=TABLE_ORDER.index):
+        print(f"📥 Load {sources[table]} -> {table}")
+        loaded, rejected, elapsed = ingest_table(
+            engine, table, sources[table], batch_size=args.batch_size, on_invalid=args.on_invalid
+        )
+        rate = loaded / elapsed if elapsed > 0 else 0
+        print(f"✅ {table}: {loaded:,} baris dalam {elapsed:.1f} detik ({rate:,.0f} baris/detik)")
+        if rejected:
+            print(f"⚠️ {table}: {rejected:,} baris dilewati karena foreign key tidak valid")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+# load_test.py
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ====================================================
+# LOAD TEST SESI KONKUREN (HEADLESS, APP TESTING API)
+# ====================================================
+# Contoh:
+#   python load_test.py --levels 1 2 4 8 16 --reruns 20
+#   python load_test.py --database-url sqlite:///pariwisata.db --levels 4 8 --cache cold
+#
+# Semua sesi berjalan di satu proses sehingga st.cache_data/st.cache_resource
+# dipakai bersama lintas sesi dan lintas level. Mode --cache menentukan
+# kondisi awal setiap level:
+#   warm: satu rerun tanpa pengukuran sebelum level pertama (cache sudah panas)
+#   cold: cache dikosongkan sebelum setiap level (setiap level bayar cold load)
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app_streamlit.py')
+
+NAMA_KOTA = ['Jakarta', 'Yogyakarta', 'Bandung', 'Semarang', 'Surabaya', 'Denpasar', 'Medan', 'Makassar']
+NAMA_KATEGORI = ['Bahari', 'Budaya', 'Taman Hiburan', 'Cagar Alam', 'Pusat Perbelanjaan', 'Tempat Ibadah']
+KATA_TEMPAT = ['Pantai', 'Taman', 'Museum', 'Candi', 'Gunung', 'Danau', 'Air Terjun', 'Bukit', 'Pulau', 'Goa']
+
+# Penghitung query database seluruh proses (semua engine)
+_query_lock = threading.Lock()
+_query_count = 0
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    global _query_count
+    with _query_lock:
+        _query_count += 1
+
+
+def make_synthetic_db(path, n_destinations=5_000, n_users=20_000, n_reviews=200_000, seed=0):
+    """Buat database SQLite sintetis dengan skema yang dibaca dashboard"""
+    rng = np.random.default_rng(seed)
+    cities = pd.DataFrame({'id_kota': np.arange(1, len(NAMA_KOTA) + 1), 'nama_kota': NAMA_KOTA})
+    categories = pd.DataFrame({'id_kategori': np.arange(1, len(NAMA_KATEGORI) + 1), 'nama_kategori': NAMA_KATEGORI})
+    destinations = pd.DataFrame({
+        'id_tempat': np.arange(1, n_destinations + 1),
+        'nama_tempat': [
+            f"{KATA_TEMPAT[a]} {KATA_TEMPAT[b]} {i}"
+            for i, (a, b) in enumerate(rng.integers(0, len(KATA_TEMPAT), (n_destinations, 2)), start=1)
+        ],
+        'id_kota': rng.integers(1, len(NAMA_KOTA) + 1, n_destinations),
+        'id_kategori': rng.integers(1, len(NAMA_KATEGORI) + 1, n_destinations),
+        'rating_rata2': rng.uniform(2.5, 5.0, n_destinations).round(1),
+        'harga_tiket': rng.integers(0, 50, n_destinations) * 5_000,
+        'lat': rng.uniform(-10.0, 5.0, n_destinations),
+        'long': rng.uniform(95.0, 140.0, n_destinations),
+    })
+    users = pd.DataFrame({
+        'id_pengguna': np.arange(1, n_users + 1),
+        'asal_kota': rng.choice(NAMA_KOTA, n_users),
+        'umur': rng.integers(17, 60, n_users),
+    })
+    reviews = pd.DataFrame({
+        'id_pengguna': rng.integers(1, n_users + 1, n_reviews),
+        'id_tempat': rng.integers(1, n_destinations + 1, n_reviews),
+        'rating': rng.integers(1, 6, n_reviews),
+    })
+
+    if os.path.exists(path):
+        os.remove(path)
+    with sqlite3.connect(path) as conn:
+        for table, df in [('cities', cities), ('categories', categories), ('destinations', destinations),
+                          ('users', users), ('reviews', reviews)]:
+            df.to_sql(table, conn, index=False)
+    return path
+
+
+def resident_memory_mb():
+    """RSS proses saat ini dalam MB"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        # Unix lain: pakai puncak RSS sebagai pendekatan (modul resource tidak ada di Windows)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return float('nan')
+
+
+def _randomize(at, rng):
+    """Ubah filter sidebar dan interaksi di dalam tab secara acak"""
+    cities, categories = at.sidebar.multiselect[0], at.sidebar.multiselect[1]
+    cities.set_value(rng.sample(cities.options, rng.randint(1, len(cities.options))))
+    categories.set_value(rng.sample(categories.options, rng.randint(1, len(categories.options))))
+    at.sidebar.slider[0].set_value(round(rng.uniform(0.0, 4.5), 1))
+
+    # Streamlit mengeksekusi semua tab setiap rerun; "pindah tab" disimulasikan
+    # dengan berinteraksi dengan widget di tab Destinasi dan Peta
+    action = rng.choice(['filter', 'search', 'nearby'])
+    if action == 'search':
+        at.text_input[0].set_value(rng.choice(KATA_TEMPAT)[:rng.randint(2, 5)])
+    elif action == 'nearby':
+        at.radio[1].set_value(rng.choice(at.radio[1].options))
+
+
+def _run_session(database_url, session_id, reruns, timeout, seed, latencies, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=timeout)
+    # st.secrets adalah prioritas pertama konfigurasi database di app
+    at.secrets['DATABASE_URL'] = database_url
+    for i in range(reruns + 1):
+        if i > 0:
+            _randomize(at, rng)
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            errors.append(at.exception[0].message)
+    return at
+
+
+def clear_caches():
+    """Kosongkan cache Streamlit proses ini (termasuk memo QueryExecutor di cache_resource)"""
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def warm_up(database_url, timeout=60):
+    """Satu rerun tanpa pengukuran supaya level pertama tidak menanggung cold load"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=timeout)
+    at.secrets['DATABASE_URL'] = database_url
+    at.run()
+
+
+def run_level(database_url, concurrency, reruns, timeout=60, seed=0, cache='warm'):
+    """Jalankan N sesi paralel, kembalikan ringkasan latency/query/memori
+
+    rss_per_sesi_mb adalah selisih RSS seluruh proses sebelum/sesudah level
+    dibagi jumlah sesi, bukan memori yang diukur per sesi.
+    """
+    if cache == 'cold':
+        clear_caches()
+    latencies, errors, sessions = [], [], [None] * concurrency
+    rss_before = resident_memory_mb()
+    with _query_lock:
+        queries_before = _query_count
+
+    def worker(i):
+        sessions[i] = _run_session(database_url, i, reruns, timeout, seed, latencies, errors)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    with _query_lock:
+        queries = _query_count - queries_before
+    rss_after = resident_memory_mb()
+    lat_ms = np.array(latencies) * 1000
+    return {
+        'cache': cache,
+        'sesi': concurrency,
+        'rerun': len(latencies),
+        'p50_ms': np.percentile(lat_ms, 50),
+        'p95_ms': np.percentile(lat_ms, 95),
+        'p99_ms': np.percentile(lat_ms, 99),
+        'rerun_per_detik': len(latencies) / wall,
+        'query_per_rerun': queries / max(len(latencies), 1),
+        'rss_per_sesi_mb': max(rss_after - rss_before, 0) / concurrency,
+        'rss_total_mb': rss_after,
+        'error': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test app_streamlit.py dengan banyak sesi paralel")
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8], help="Daftar jumlah sesi konkuren")
+    parser.add_argument('--reruns', type=int, default=10, help="Jumlah rerun acak per sesi")
+    parser.add_argument('--timeout', type=float, default=60, help="Timeout satu rerun (detik)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--database-url', default=None, help="Default: database SQLite sintetis sementara")
+    parser.add_argument('--destinations', type=int, default=5_000, help="Jumlah destinasi sintetis")
+    parser.add_argument('--users', type=int, default=20_000, help="Jumlah pengguna sintetis")
+    parser.add_argument('--reviews', type=int, default=200_000, help="Jumlah review sintetis")
+    parser.add_argument('--cache', choices=['warm', 'cold'], default='warm',
+                        help="warm: satu rerun pemanasan sebelum level pertama; "
+                             "cold: cache Streamlit dikosongkan sebelum setiap level")
+    parser.add_argument('--output', default=None, help="Simpan kurva hasil ke CSV")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(), 'pariwisata_loadtest.db')
+        make_synthetic_db(path, args.destinations, args.users, args.reviews, seed=args.seed)
+        database_url = f"sqlite:///{path}"
+        print(f"🧪 Database sintetis: {path}")
+
+    if args.cache == 'warm':
+        warm_up(database_url, timeout=args.timeout)
+        print("🔥 Mode cache warm: cache dipanaskan sekali sebelum level pertama")
+    else:
+        print("🧊 Mode cache cold: cache Streamlit dikosongkan sebelum setiap level")
+    print("ℹ️ MB/sesi = selisih RSS seluruh proses per level dibagi jumlah sesi")
+
+    results = []
+    for level in args.levels:
+        result = run_level(database_url, level, args.reruns, timeout=args.timeout, seed=args.seed, cache=args.cache)
+        results.append(result)
+        print(
+            f"👥 {result['sesi']:>3} sesi | p50 {result['p50_ms']:7.1f} ms | p95 {result['p95_ms']:7.1f} ms | "
+            f"p99 {result['p99_ms']:7.1f} ms | {result['query_per_rerun']:.2f} query/rerun | "
+            f"{result['rss_per_sesi_mb']:.1f} MB/sesi | {result['error']} error"
+        )
+
+    if args.output:
+        pd.DataFrame(results).to_csv(args.output, index=False)
+        print(f"✅ Hasil disimpan ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
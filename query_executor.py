@@ -0,0 +1,182 @@
+# query_executor.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import text
+
+# ====================================================
+# EKSEKUTOR QUERY: SINGLE-FLIGHT + PEMBATALAN QUERY YATIM
+# ====================================================
+
+
+class QueryCancelled(Exception):
+    """Query dibatalkan karena tidak lagi ditunggu atau melewati timeout"""
+
+    def __init__(self, reason):
+        super().__init__(f"Query dibatalkan ({reason})")
+        self.reason = reason
+
+
+def cancel_backend(dbapi_conn):
+    """Hentikan query yang sedang berjalan di koneksi DBAPI (aman dari thread lain)"""
+    if hasattr(dbapi_conn, 'cancel'):
+        # psycopg2: kirim cancel request ke server PostgreSQL
+        dbapi_conn.cancel()
+    elif hasattr(dbapi_conn, 'interrupt'):
+        # sqlite3
+        dbapi_conn.interrupt()
+
+
+class _Flight:
+    """Satu query yang sedang berjalan beserta pemanggil yang menunggunya"""
+
+    def __init__(self, key):
+        self.key = key
+        self.waiters = set()
+        self.dbapi_conn = None
+        self.cancel_reason = None
+        self.abandoned = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class QueryExecutor:
+    """Single-flight query + memo hasil per proses, dengan pembatalan query yatim
+
+    Pemanggil yang menunggu query identik menumpang satu eksekusi. Selama
+    menunggu, ``yield_check`` milik rerun Streamlit dipanggil berkala; jika sesi
+    sudah meminta rerun/stop, pemanggil keluar dan query yang tidak lagi
+    ditunggu siapa pun dibatalkan setelah jeda ``supersede_grace``.
+    """
+
+    # Interval cek rerun/stop saat menunggu (sama dengan lock cache Streamlit)
+    POLL_SECONDS = 0.1
+
+    def __init__(self, engine, timeout=30, supersede_grace=5, max_workers=8):
+        self.engine = engine
+        self.timeout = timeout
+        # Jeda sebelum query tanpa penunggu dibatalkan, memberi kesempatan
+        # rerun baru mengirim query yang sama dan mengambil alihnya
+        self.supersede_grace = supersede_grace
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='query')
+        self._cond = threading.Condition()
+        self._flights = {}
+        self._results = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.taken_over = 0
+        self.cancelled = 0
+        self.timed_out = 0
+
+    def read_sql(self, sql, params=None, yield_check=None):
+        """pd.read_sql dengan memo hasil; query identik yang sedang jalan ditumpangi
+
+        DataFrame hasil dibagi lintas sesi, jangan diubah in-place.
+        """
+        key = (sql, tuple(sorted((params or {}).items())))
+        waiter = object()
+        with self._cond:
+            if key in self._results:
+                return self._results[key]
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight(key)
+                self._flights[key] = flight
+                self.executed += 1
+                self._pool.submit(self._run, flight, sql, params)
+            elif flight.abandoned:
+                # Ditinggal rerun yang sudah usang, dipakai lagi oleh rerun baru
+                flight.abandoned = False
+                self.taken_over += 1
+            else:
+                self.coalesced += 1
+            flight.waiters.add(waiter)
+
+            try:
+                while not flight.done:
+                    self._cond.wait(self.POLL_SECONDS)
+                    if yield_check is not None and not flight.done:
+                        # Melempar exception rerun/stop Streamlit jika ada permintaan baru
+                        yield_check()
+            except BaseException:
+                flight.waiters.discard(waiter)
+                if not flight.waiters and not flight.done:
+                    flight.abandoned = True
+                    timer = threading.Timer(self.supersede_grace, self._cancel, (flight, 'superseded', True))
+                    timer.daemon = True
+                    timer.start()
+                raise
+            flight.waiters.discard(waiter)
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def clear(self):
+        """Kosongkan memo hasil (query berikutnya dibaca ulang dari database)"""
+        with self._cond:
+            self._results.clear()
+
+    def _run(self, flight, sql, params):
+        timer = threading.Timer(self.timeout, self._cancel, (flight, 'timeout'))
+        timer.daemon = True
+        timer.start()
+        try:
+            with self.engine.connect() as conn:
+                with self._cond:
+                    flight.dbapi_conn = conn.connection.driver_connection
+                    if flight.cancel_reason:
+                        raise QueryCancelled(flight.cancel_reason)
+                result = pd.read_sql(text(sql), conn, params=params)
+            with self._cond:
+                if flight.cancel_reason:
+                    raise QueryCancelled(flight.cancel_reason)
+            flight.result = result
+        except Exception as e:
+            flight.error = QueryCancelled(flight.cancel_reason) if flight.cancel_reason else e
+        finally:
+            timer.cancel()
+            with self._cond:
+                flight.done = True
+                flight.dbapi_conn = None
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                    if flight.error is None:
+                        self._results[flight.key] = flight.result
+                self._cond.notify_all()
+
+    def _cancel(self, flight, reason, only_if_abandoned=False):
+        with self._cond:
+            if flight.done or flight.cancel_reason:
+                return
+            if only_if_abandoned and not flight.abandoned:
+                # Sudah diambil alih rerun baru sebelum jeda habis
+                return
+            flight.cancel_reason = reason
+            if reason == 'timeout':
+                self.timed_out += 1
+            else:
+                self.cancelled += 1
+            # Query identik berikutnya harus mulai baru, bukan menumpang yang dibatalkan
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            dbapi_conn = flight.dbapi_conn
+        if dbapi_conn is not None:
+            try:
+                cancel_backend(dbapi_conn)
+            except Exception as e:
+                print(f"⚠️ Gagal membatalkan query di database: {e}")
+
+    def stats(self):
+        with self._cond:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'taken_over': self.taken_over,
+                'cancelled': self.cancelled,
+                'timed_out': self.timed_out,
+                'in_flight': len(self._flights),
+                'cached': len(self._results),
+            }
@@ -0,0 +1,60 @@
+# reviewer_index.py
+import numpy as np
+import pandas as pd
+
+# ====================================================
+# INDEX DESTINASI -> PENGGUNA YANG MEREVIEW (CSR)
+# ====================================================
+
+
+def csr_entries(indptr, positions):
+    """Indeks entri CSR milik baris-baris terpilih, tanpa loop Python"""
+    positions = np.asarray(positions, dtype=np.int64)
+    starts = indptr[positions]
+    lengths = indptr[positions + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+class ReviewerIndex:
+    """Daftar posisi pengguna (dan baris review) per posisi destinasi, untuk semi-join cepat"""
+
+    def __init__(self, destination_ids, user_ids, reviews_destination_ids, reviews_user_ids):
+        destination_ids = np.asarray(destination_ids)
+        user_ids = np.asarray(user_ids)
+        self.n_destinations = len(destination_ids)
+        self.n_users = len(user_ids)
+
+        # Petakan id ke posisi baris; review dengan id tak dikenal dibuang
+        dest_pos = self._positions(destination_ids, np.asarray(reviews_destination_ids))
+        user_pos = self._positions(user_ids, np.asarray(reviews_user_ids))
+        valid = (dest_pos >= 0) & (user_pos >= 0)
+
+        # Baris review per destinasi (semua review dengan destinasi dikenal)
+        known = np.flatnonzero(dest_pos >= 0)
+        self.review_rows = known[np.argsort(dest_pos[known], kind='stable')]
+        self.review_destinations = dest_pos[self.review_rows].astype(np.int32)
+        self.review_indptr = np.searchsorted(self.review_destinations, np.arange(self.n_destinations + 1))
+
+        dest_pos, user_pos = dest_pos[valid], user_pos[valid]
+
+        # Pasangan unik (destinasi, pengguna), terurut per destinasi
+        pairs = np.unique(dest_pos.astype(np.int64) * max(self.n_users, 1) + user_pos)
+        self.users = (pairs % max(self.n_users, 1)).astype(np.int32)
+        self.indptr = np.searchsorted(pairs // max(self.n_users, 1), np.arange(self.n_destinations + 1))
+
+    @staticmethod
+    def _positions(ids, lookup):
+        """Posisi tiap nilai lookup di array ids (-1 jika tidak ada)"""
+        return pd.Index(ids).get_indexer(lookup)
+
+    def reviewer_mask(self, destination_positions):
+        """Mask boolean pengguna yang mereview salah satu destinasi terpilih"""
+        mask = np.zeros(self.n_users, dtype=bool)
+        mask[self.users[csr_entries(self.indptr, destination_positions)]] = True
+        return mask
+
+    def reviews_of(self, destination_positions):
+        """(posisi baris review, posisi destinasinya) untuk destinasi terpilih"""
+        entries = csr_entries(self.review_indptr, destination_positions)
+        return self.review_rows[entries], self.review_destinations[entries]
@@ -0,0 +1,193 @@
+# search_index.py
+import re
+import unicodedata
+
+import numpy as np
+
+# ====================================================
+# INDEX PENCARIAN NAMA DESTINASI (TRIGRAM)
+# ====================================================
+
+# Hasil "mirip" (toleran typo): setiap salah ketik merusak hingga 3 trigram,
+# diizinkan satu salah ketik per 5 huruf query, dan minimal separuh trigram cocok.
+# Dua huruf bersebelahan yang tertukar dihitung satu salah ketik lewat varian query.
+FUZZY_GRAMS_PER_TYPO = 3
+FUZZY_CHARS_PER_TYPO = 5
+FUZZY_MIN_OVERLAP = 0.5
+
+# Tingkat relevansi hasil: makin kecil makin relevan
+TIER_PREFIX = 0
+TIER_SUBSTRING = 1
+TIER_FUZZY = 2
+
+
+def normalize(text):
+    """Huruf kecil, tanpa aksen dan tanda baca, spasi tunggal"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r'[^0-9a-z]+', ' ', text.lower())
+    return text.strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded(text):
+    # Dua spasi di depan setiap kata supaya awal kata punya trigram sendiri
+    return ' '.join('  ' + word for word in text.split()) + ' '
+
+
+def _edge_trigrams(text):
+    """Trigram awal dan akhir setiap kata (mengandung spasi padding)"""
+    return {
+        gram
+        for word in text.split()
+        for gram in _trigrams('  ' + word + ' ')
+        if ' ' in gram
+    }
+
+
+def _transpositions(text):
+    """Varian teks dengan satu pasang huruf bersebelahan ditukar (pnatai -> pantai)"""
+    return {
+        text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        for i in range(len(text) - 1)
+        if text[i] != text[i + 1] and ' ' not in text[i:i + 2]
+    }
+
+
+def fuzzy_min_matches(query_length, n_grams):
+    """Jumlah minimal trigram cocok untuk hasil mirip, diskalakan dengan panjang query"""
+    typos = max(1, query_length // FUZZY_CHARS_PER_TYPO)
+    return max(n_grams - typos * FUZZY_GRAMS_PER_TYPO, int(np.ceil(n_grams * FUZZY_MIN_OVERLAP)), 1)
+
+
+class SearchIndex:
+    """Inverted index trigram (format CSR) atas kolom nama_tempat"""
+
+    def __init__(self, names, ratings):
+        self.names = [normalize(name) for name in names]
+        self.ratings = np.nan_to_num(np.asarray(ratings, dtype=np.float64), nan=-1.0)
+        self.size = len(self.names)
+
+        postings = {}
+        for pos, name in enumerate(self.names):
+            # Trigram nama utuh (substring lintas kata) + trigram awal kata
+            for gram in _trigrams(name) | _trigrams(_padded(name)):
+                postings.setdefault(gram, []).append(pos)
+
+        self.gram_ids = {}
+        offsets = [0]
+        flat = []
+        for gram_id, (gram, positions) in enumerate(postings.items()):
+            self.gram_ids[gram] = gram_id
+            flat.extend(positions)
+            offsets.append(len(flat))
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.postings = np.asarray(flat, dtype=np.int32)
+
+    def _posting(self, gram):
+        gram_id = self.gram_ids.get(gram)
+        if gram_id is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[gram_id]:self.offsets[gram_id + 1]]
+
+    def _count(self, grams):
+        """Jumlah trigram yang cocok per posisi baris"""
+        if not grams:
+            return np.zeros(self.size, dtype=np.int64)
+        return np.bincount(
+            np.concatenate([self._posting(gram) for gram in grams]),
+            minlength=self.size
+        )
+
+    def search(self, query, allowed_positions=None, limit=None):
+        """Posisi baris yang cocok dengan query, urut relevansi lalu rating"""
+        q = normalize(query)
+        if not q:
+            return np.empty(0, dtype=np.int64)
+
+        # Query pendek hanya dicocokkan sebagai awalan kata
+        short = len(q) < 3
+        grams = sorted(_trigrams(_padded(q).rstrip()) if short else _trigrams(q))
+        # Trigram tepi kata ikut dihitung untuk skor mirip: menyelamatkan query
+        # pendek yang typo-nya merusak hampir semua trigram di tengah kata
+        edge_grams = [] if short else sorted(_edge_trigrams(q) - set(grams))
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+
+        counts = self._count(grams)
+        if allowed_positions is not None:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[allowed_positions] = True
+            counts[~allowed] = 0
+
+        if short:
+            positions = np.flatnonzero(counts == len(grams))
+            tiers = np.full(len(positions), TIER_PREFIX)
+        else:
+            scores = counts + self._count(edge_grams)
+            if allowed_positions is not None:
+                scores[~allowed] = 0
+            query_grams = set(grams) | set(edge_grams)
+            matched = scores >= fuzzy_min_matches(len(q), len(query_grams))
+            # Varian huruf tertukar: skor = skor query dikoreksi trigram yang berubah saja
+            for variant in sorted(_transpositions(q)):
+                variant_grams = _trigrams(variant) | _edge_trigrams(variant)
+                added = [gram for gram in sorted(variant_grams - query_grams) if gram in self.gram_ids]
+                if not added:
+                    # Tidak ada trigram baru yang dikenal index: varian tidak mungkin lebih baik
+                    continue
+                variant_scores = (
+                    scores
+                    + self._count(added)
+                    - self._count(sorted(query_grams - variant_grams))
+                )
+                if allowed_positions is not None:
+                    variant_scores[~allowed] = 0
+                matched |= variant_scores >= fuzzy_min_matches(len(q), len(variant_grams))
+                np.maximum(scores, variant_scores, out=scores)
+            positions = np.flatnonzero(matched)
+            # Semua trigram cocok = potongan kata; ditambah trigram awal kata = awalan
+            word_start = np.zeros(self.size, dtype=bool)
+            word_start[self._posting(' ' + q[:2])] = True
+            full = counts[positions] == len(grams)
+            counts = scores
+            tiers = np.where(
+                full,
+                np.where(word_start[positions], TIER_PREFIX, TIER_SUBSTRING),
+                TIER_FUZZY
+            )
+
+        # Dalam satu tingkat: trigram cocok terbanyak dulu, lalu rating
+        order = np.lexsort((-self.ratings[positions], -counts[positions], tiers))
+        positions = positions[order]
+        if limit is not None:
+            positions = positions[:limit]
+        return positions
+
+
+if __name__ == '__main__':
+    # Cek perilaku toleransi typo: python search_index.py
+    contoh = ['Pantai Sanur', 'Gunung Bromo', 'Pantai Kuta', 'Museum Bank Indonesia',
+              'Candi Borobudur', 'Danau Toba', 'Gunung Rinjani', 'Taman Sari']
+    index = SearchIndex(contoh, np.full(len(contoh), 4.0))
+    kasus = {
+        'bromo': 'Gunung Bromo',            # awalan / kata utuh
+        'brmo': 'Gunung Bromo',             # huruf hilang
+        'sanru': 'Pantai Sanur',            # tertukar di akhir kata
+        'pnatai': 'Pantai Kuta',            # tertukar di awal kata
+        'musuem': 'Museum Bank Indonesia',  # tertukar di tengah kata
+        'gunnug': 'Gunung Rinjani',
+        'toab': 'Danau Toba',
+        'borobdur': 'Candi Borobudur',
+        'museum bnak': 'Museum Bank Indonesia',
+    }
+    gagal = 0
+    for query, harapan in kasus.items():
+        hasil = [contoh[pos] for pos in index.search(query)]
+        ok = harapan in hasil
+        gagal += not ok
+        print(f"{'✅' if ok else '❌'} {query!r} -> {hasil[:3]}")
+    raise SystemExit(1 if gagal else 0)
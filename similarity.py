@@ -0,0 +1,214 @@
+# similarity.py
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+# ====================================================
+# DESTINASI SERUPA DARI CO-OCCURRENCE REVIEW
+# ====================================================
+# Batch offline:  python similarity.py --top-k 20 --memory-mb 512
+# Dashboard hanya membaca hasilnya (file .npz) dengan lookup O(k).
+
+DEFAULT_PATH = os.getenv('SIMILARITY_PATH', 'similar_destinations.npz')
+
+# Pengguna dengan review sangat banyak dipotong agar pasangan tidak meledak (m^2)
+MAX_ITEMS_PER_USER = 200
+
+# Redam skor pasangan yang hanya di-review bersama oleh sedikit pengguna
+SHRINKAGE = 10.0
+
+# Memori kerja per pasangan (diukur dengan tracemalloc): array left/right/offsets,
+# key, produk dan count sementara, ditambah salinan saat sort di _reduce
+PAIR_BYTES = 120
+
+
+class SimilarityTable:
+    """Top-k destinasi serupa per destinasi dalam format CSR"""
+
+    def __init__(self, item_ids, indptr, neighbors, scores):
+        self.item_ids = np.asarray(item_ids)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self._index = {item_id: i for i, item_id in enumerate(self.item_ids.tolist())}
+
+    def similar(self, id_tempat, k=None):
+        """(id_tempat serupa, skor) untuk satu destinasi, urut skor tertinggi"""
+        i = self._index.get(id_tempat)
+        if i is None:
+            return self.item_ids[:0], self.scores[:0]
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        if k is not None:
+            hi = min(hi, lo + k)
+        return self.item_ids[self.neighbors[lo:hi]], self.scores[lo:hi]
+
+    def save(self, path=DEFAULT_PATH):
+        np.savez_compressed(
+            path,
+            item_ids=self.item_ids,
+            indptr=self.indptr,
+            neighbors=self.neighbors,
+            scores=self.scores
+        )
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path) as data:
+            return cls(data['item_ids'], data['indptr'], data['neighbors'], data['scores'])
+
+
+def _user_item_matrix(user_ids, item_ids, ratings, max_items_per_user):
+    """Matriks sparse pengguna x destinasi (CSR), review ganda dirata-rata"""
+    users, user_codes = np.unique(user_ids, return_inverse=True)
+    items, item_codes = np.unique(item_ids, return_inverse=True)
+    n_items = len(items)
+
+    keys = user_codes.astype(np.int64) * n_items + item_codes
+    order = np.argsort(keys, kind='stable')
+    keys, ratings = keys[order], np.asarray(ratings, dtype=np.float64)[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    values = np.add.reduceat(ratings, starts) / np.diff(np.r_[starts, len(keys)])
+    keys = keys[starts]
+
+    row = keys // n_items
+    col = (keys % n_items).astype(np.int32)
+
+    # Potong pengguna yang terlalu aktif: ambil sampel acak max_items_per_user review
+    shuffled = np.lexsort((np.random.default_rng(0).random(len(row)), row))
+    row_starts = np.searchsorted(row, np.arange(len(users) + 1))
+    rank = np.arange(len(row)) - np.repeat(row_starts[:-1], np.diff(row_starts))
+    keep = np.sort(shuffled[rank < max_items_per_user])
+    row, col, values = row[keep], col[keep], values[keep].astype(np.float32)
+    indptr = np.searchsorted(row, np.arange(len(users) + 1))
+    return items, indptr, col, values
+
+
+def build_similarity(user_ids, item_ids, ratings, top_k=20, memory_mb=512,
+                     max_items_per_user=MAX_ITEMS_PER_USER, shrinkage=SHRINKAGE):
+    """Hitung cosine similarity item-item dengan batas top-k per destinasi
+
+    Pasangan dibangkitkan per blok destinasi dan per batch pengguna sehingga
+    memori kerja pasangan kira-kira dibatasi ``memory_mb``. Pembentukan matriks
+    pengguna x destinasi di awal butuh tambahan ~90 byte per review.
+    """
+    items, indptr, cols, values = _user_item_matrix(user_ids, item_ids, ratings, max_items_per_user)
+    n_items = len(items)
+    lengths = np.diff(indptr)
+    entry_user = np.repeat(np.arange(len(lengths)), lengths)
+
+    norms = np.sqrt(np.bincount(cols, weights=values.astype(np.float64) ** 2, minlength=n_items))
+
+    budget_pairs = max(1, memory_mb * 1024 * 1024 // PAIR_BYTES)
+    block_items = int(max(1, min(n_items, budget_pairs // max(n_items, 1))))
+
+    out_items, out_neighbors, out_scores = [], [], []
+
+    for block_start in range(0, n_items, block_items):
+        block_end = min(block_start + block_items, n_items)
+        # Entri yang destinasinya ada di blok ini menjadi sisi kiri pasangan
+        left_entries = np.flatnonzero((cols >= block_start) & (cols < block_end))
+        pair_counts = lengths[entry_user[left_entries]]
+        acc_keys, acc_dot, acc_co = [], [], []
+
+        batch_bounds = np.searchsorted(np.cumsum(pair_counts), np.arange(0, pair_counts.sum(), budget_pairs), side='right')
+        batch_bounds = np.unique(np.r_[0, batch_bounds, len(left_entries)])
+        for lo, hi in zip(batch_bounds[:-1], batch_bounds[1:]):
+            entries = left_entries[lo:hi]
+            m = pair_counts[lo:hi]
+            left = np.repeat(entries, m)
+            # Sisi kanan: semua entri milik pengguna yang sama
+            offsets = np.arange(m.sum()) - np.repeat(np.cumsum(m) - m, m)
+            right = np.repeat(indptr[entry_user[entries]], m) + offsets
+            same = cols[left] == cols[right]
+            left, right = left[~same], right[~same]
+
+            keys = (cols[left].astype(np.int64) - block_start) * n_items + cols[right]
+            acc_keys.append(keys)
+            acc_dot.append(values[left].astype(np.float64) * values[right])
+            acc_co.append(np.ones(len(keys), dtype=np.int64))
+            acc_keys, acc_dot, acc_co = _reduce(acc_keys, acc_dot, acc_co)
+
+        if not acc_keys or len(acc_keys[0]) == 0:
+            continue
+        keys, dot, co = acc_keys[0], acc_dot[0], acc_co[0]
+        a = keys // n_items + block_start
+        b = keys % n_items
+        denom = norms[a] * norms[b]
+        score = np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0) * (co / (co + shrinkage))
+
+        # Top-k per destinasi kiri: urutkan per (a, skor menurun), ambil k pertama
+        order = np.lexsort((-score, a))
+        a, b, score = a[order], b[order], score[order]
+        group_start = np.searchsorted(a, a, side='left')
+        keep = (np.arange(len(a)) - group_start) < top_k
+        out_items.append(a[keep])
+        out_neighbors.append(b[keep].astype(np.int32))
+        out_scores.append(score[keep].astype(np.float32))
+
+    # Blok diproses berurutan dan sudah terurut per destinasi, jadi cukup digabung
+    out_items = np.concatenate(out_items) if out_items else np.empty(0, dtype=np.int64)
+    counts = np.bincount(out_items, minlength=n_items)
+    return SimilarityTable(
+        items,
+        np.r_[0, np.cumsum(counts)],
+        np.concatenate(out_neighbors) if out_neighbors else np.empty(0, dtype=np.int32),
+        np.concatenate(out_scores) if out_scores else np.empty(0, dtype=np.float32)
+    )
+
+
+def _reduce(acc_keys, acc_dot, acc_co):
+    """Gabungkan akumulator pasangan yang key-nya sama"""
+    keys = np.concatenate(acc_keys)
+    dot = np.concatenate(acc_dot)
+    co = np.concatenate(acc_co)
+    if len(keys) == 0:
+        return [keys], [dot], [co]
+    order = np.argsort(keys, kind='stable')
+    keys, dot, co = keys[order], dot[order], co[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return [keys[starts]], [np.add.reduceat(dot, starts)], [np.add.reduceat(co, starts)]
+
+
+def read_reviews(engine, chunksize=500_000):
+    """Baca tabel reviews per chunk ke array numpy yang ringkas"""
+    users, items, ratings = [], [], []
+    for chunk in pd.read_sql("SELECT id_pengguna, id_tempat, rating FROM reviews", engine, chunksize=chunksize):
+        chunk = chunk.dropna()
+        users.append(chunk['id_pengguna'].to_numpy())
+        items.append(chunk['id_tempat'].to_numpy())
+        ratings.append(chunk['rating'].to_numpy(dtype=np.float32))
+    if not users:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    return np.concatenate(users), np.concatenate(items), np.concatenate(ratings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun tabel destinasi serupa dari tabel reviews")
+    parser.add_argument('--output', default=DEFAULT_PATH, help="Path file .npz hasil")
+    parser.add_argument('--top-k', type=int, default=20, help="Jumlah destinasi serupa per destinasi")
+    parser.add_argument('--memory-mb', type=int, default=512, help="Perkiraan batas memori kerja")
+    parser.add_argument('--database-url', default=None,
+                        help="URL database (default: konfigurasi dari config.py)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from config import engine
+
+    start = time.perf_counter()
+    user_ids, item_ids, ratings = read_reviews(engine)
+    print(f"📥 {len(user_ids):,} review dimuat dalam {time.perf_counter() - start:.1f} detik")
+
+    table = build_similarity(user_ids, item_ids, ratings, top_k=args.top_k, memory_mb=args.memory_mb)
+    table.save(args.output)
+    print(f"✅ {len(table.item_ids):,} destinasi, {len(table.neighbors):,} pasangan disimpan ke {args.output} "
+          f"({time.perf_counter() - start:.1f} detik)")
+
+
+if __name__ == '__main__':
+    main()
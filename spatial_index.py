@@ -0,0 +1,115 @@
+# spatial_index.py
+import numpy as np
+
+# ====================================================
+# INDEX SPASIAL KOORDINAT DESTINASI (GRID)
+# ====================================================
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Ukuran sel grid dalam derajat (~28 km di ekuator)
+DEFAULT_CELL_DEG = 0.25
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak great-circle dalam km, mendukung array numpy"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2 +
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    """Grid lat/long dengan posisi baris dikelompokkan per sel (format CSR)"""
+
+    def __init__(self, lats, lons, cell_deg=DEFAULT_CELL_DEG):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.size = len(lats)
+
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        self.lats = lats
+        self.lons = lons
+
+        rows = np.floor((lats[valid] + 90.0) / cell_deg).astype(np.int64)
+        cols = np.floor((lons[valid] + 180.0) / cell_deg).astype(np.int64)
+        self.n_rows = int(np.ceil(180.0 / cell_deg)) + 1
+        self.n_cols = int(np.ceil(360.0 / cell_deg)) + 1
+        keys = rows * self.n_cols + cols
+
+        order = np.argsort(keys, kind='stable')
+        self.positions = valid[order]
+        self.cell_keys, starts = np.unique(keys[order], return_index=True)
+        self.cell_starts = np.append(starts, len(order)).astype(np.int64)
+
+    def _cell(self, lat, lon):
+        return (
+            int(np.floor((lat + 90.0) / self.cell_deg)),
+            int(np.floor((lon + 180.0) / self.cell_deg)),
+        )
+
+    def _candidates(self, row_min, row_max, col_min, col_max):
+        """Posisi baris di semua sel dalam kotak [row_min..row_max] x [col_min..col_max]"""
+        row_min = max(row_min, 0)
+        row_max = min(row_max, self.n_rows - 1)
+        chunks = []
+        for row in range(row_min, row_max + 1):
+            # Sel dalam satu baris grid berurutan, cukup satu searchsorted per baris
+            lo = np.searchsorted(self.cell_keys, row * self.n_cols + max(col_min, 0), side='left')
+            hi = np.searchsorted(self.cell_keys, row * self.n_cols + min(col_max, self.n_cols - 1), side='right')
+            if hi > lo:
+                chunks.append(self.positions[self.cell_starts[lo]:self.cell_starts[hi]])
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def _span(self, lat, radius_km):
+        """Jumlah sel ke utara/selatan dan timur/barat yang dicakup radius"""
+        lat_cells = int(np.ceil(radius_km / 111.32 / self.cell_deg))
+        cos_lat = max(np.cos(np.radians(min(abs(lat) + radius_km / 111.32, 89.0))), 1e-6)
+        lon_cells = int(np.ceil(radius_km / (111.32 * cos_lat) / self.cell_deg))
+        return lat_cells, min(lon_cells, self.n_cols)
+
+    def _filter_allowed(self, candidates, allowed):
+        if allowed is None or len(candidates) == 0:
+            return candidates
+        return candidates[allowed[candidates]]
+
+    def within_radius(self, lat, lon, radius_km, allowed=None):
+        """Posisi dan jarak (km) destinasi dalam radius, urut dari yang terdekat"""
+        # allowed: mask boolean sepanjang data untuk filter kota/kategori/rating
+        row, col = self._cell(lat, lon)
+        lat_cells, lon_cells = self._span(lat, radius_km)
+        candidates = self._candidates(row - lat_cells, row + lat_cells, col - lon_cells, col + lon_cells)
+        candidates = self._filter_allowed(candidates, allowed)
+
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def nearest(self, lat, lon, k, allowed=None):
+        """Posisi dan jarak (km) k destinasi terdekat"""
+        row, col = self._cell(lat, lon)
+        ring = 0
+        max_ring = max(self.n_rows, self.n_cols)
+        while True:
+            candidates = self._candidates(row - ring, row + ring, col - ring, col + ring)
+            candidates = self._filter_allowed(candidates, allowed)
+            exhausted = ring >= max_ring
+            if len(candidates) >= k or exhausted:
+                break
+            ring = max(1, ring * 2)
+
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        if len(distances) == 0:
+            return candidates, distances
+        # Titik di luar kotak bisa lebih dekat dari kandidat ke-k, jadi ambil
+        # ulang semua titik dalam lingkaran berjari-jari jarak ke-k
+        kth_km = np.partition(distances, min(k, len(distances)) - 1)[min(k, len(distances)) - 1]
+        positions, distances = self.within_radius(lat, lon, kth_km, allowed=allowed)
+        return positions[:k], distances[:k]